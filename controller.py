@@ -19,15 +19,17 @@
 # Imports #
 ###########
 # Standard library
-import time
+import logging
+import os
+import queue
+import threading
 import tkinter as tk
-import webbrowser
+from operator import itemgetter
 from pathlib import Path
 from tkinter import ttk
 from tkinter import messagebox
 
 # Third party
-import markdown
 import numpy as np
 
 # Custom modules
@@ -44,25 +46,74 @@ from models import csvmodel
 from models import stimulusmodel
 from models import staircase
 # Views
+# Dialog views, markdown and webbrowser are imported when first used
 from views import mainview
-from views import sessionview
-from views import audioview
-from views import calibrationview
-from views import dataview
 # Images
 from app_assets import images
 # Help
 from app_assets import README
 
 
+#############
+# Constants #
+#############
+# Console output (level is set from sessionpars['debug_mode'])
+log = logging.getLogger('peat')
+
+# Version check message table: status -> (kind, title, message, detail)
+# Messages are formatted with the VersionChecker (u) and app name
+_VERSION_HANDLERS = {
+    'mandatory': (
+        'error',
+        "New Version Available",
+        "A mandatory update is available. Please install " +
+            "version {u.new_version} to continue.",
+        "You are using version {u.app_version}, but " +
+            "version {u.new_version} is available."
+    ),
+    'optional': (
+        'warning',
+        "New Version Available",
+        "An update is available.",
+        "You are using version {u.app_version}, but " +
+            "version {u.new_version} is available."
+    ),
+    'current': None,
+    'app_not_found': (
+        'error',
+        "Update Check Failed",
+        "Cannot retrieve version number!",
+        "'{name}' does not exist in the version library."
+    ),
+    'library_inaccessible': (
+        'error',
+        "Update Check Failed",
+        "The version library is unreachable!",
+        "Please check that you have access to Starfile."
+    ),
+}
+
+
 #########
 # BEGIN #
 #########
 class Application(tk.Tk):
     """ Application root window. """
+    # Session model field types -> tk variable types
+    _VARTYPES = {
+        'bool': tk.BooleanVar,
+        'str': tk.StringVar,
+        'int': tk.IntVar,
+        'float': tk.DoubleVar
+    }
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # Configure console logging first, so warnings raised while
+        # loading sessionpars are not lost
+        logging.basicConfig(format='%(name)s: %(message)s')
+
         #############
         # Constants #
         #############
@@ -83,6 +134,17 @@ class Application(tk.Tk):
         # Intervals
         self.INTERVALS = [1, 2]
 
+        # Trial data written to file (validated in _validate_save_keys)
+        self._SAVE_KEYS = (
+            'trial', 'subject', 'condition', 'min_level', 'max_level', 
+            'duration', 'step_sizes', 'num_reversals', 'rapid_descend', 
+            'num_stim_chans', 'slm_reading', 
+            'cal_level_dB', 'slm_offset', 'adjusted_level_dB', 
+            'desired_level_dB', 'current_stair_level', 'calculated_oal', 
+            'test_freq', 'response', 'reversal'
+        )
+        self._SAVE_GETTER = itemgetter(*self._SAVE_KEYS)
+
         ######################################
         # Initialize Models, Menus and Views #
         ######################################
@@ -101,15 +163,38 @@ class Application(tk.Tk):
         # First trial flag
         self._first_run_flag = True
 
+        # Session dialog (built on first use)
+        self._session_dialog = None
+
         # Trial number tracker
         self.trial = 0
 
+        # Response (0 until an interval has been selected)
+        self.response = 0
+
+        # Sessionpars changed but not yet written to file
+        self._sessionpars_dirty = False
+
+        # Trial records waiting to be written to CSV
+        self._pending_rows = []
+        self._FLUSH_EVERY = 8
+
         # Load current session parameters from file
         # or load defaults if file does not exist yet.
         # Check for version updates and destroy if mandatory.
         self.sessionpars_model = sessionmodel.SessionParsModel(self._app_info)
         self._load_sessionpars()
 
+        # Show debug messages only in debug mode
+        log.setLevel(logging.DEBUG if self.sessionpars['debug_mode'].get() \
+            else logging.WARNING)
+
+        # Make sure every saved variable will be defined; stop before
+        # any models, threads or callbacks are set up if not
+        if not self._validate_save_keys():
+            self.destroy()
+            return
+
         # Load CSV writer model
         self.csvmodel = csvmodel.CSVModel(self.sessionpars)
 
@@ -117,7 +202,16 @@ class Application(tk.Tk):
         self.calmodel = calmodel.CalModel(self.sessionpars)
 
         # Load stimulus model
-        self.stim_model = stimulusmodel.StimulusModel(self.sessionpars)
+        self.stim_model = stimulusmodel.StimulusModel(self.sessionpars,
+            data_dir_name=self.csvmodel.data_directory)
+
+        # Start audio worker thread
+        # Audio is created and presented off the Tk main thread;
+        # errors are passed back and displayed by _drain_audio_errs
+        self._audio_q = queue.Queue()
+        self._audio_err_q = queue.Queue()
+        threading.Thread(target=self._audio_worker, daemon=True).start()
+        self.after(50, self._drain_audio_errs)
 
         # Load main view
         self.main_frame = mainview.MainFrame(self)
@@ -130,44 +224,45 @@ class Application(tk.Tk):
         self.menu = mainmenu.MainMenu(self, self._app_info)
         self.config(menu=self.menu)
 
-        # Create callback dictionary
-        event_callbacks = {
+        # Create (sequence, method) binding table
+        bindings = (
             # File menu
-            '<<FileSession>>': lambda _: self._show_session_dialog(),
-            '<<FileStart>>': lambda _: self.start_new_run(),
-            '<<FileQuit>>': lambda _: self._quit(),
+            ('<<FileSession>>', self._show_session_dialog),
+            ('<<FileStart>>', self.start_new_run),
+            ('<<FileQuit>>', self._quit),
 
             # Tools menu
-            '<<ToolsAudioSettings>>': lambda _: self._show_audio_dialog(),
-            '<<ToolsCalibration>>': lambda _: self._show_calibration_dialog(),
+            ('<<ToolsAudioSettings>>', self._show_audio_dialog),
+            ('<<ToolsCalibration>>', self._show_calibration_dialog),
 
             # Data menu
-            '<<DataCalculateThresholds>>': lambda _: self.show_scoring_dialog(),
+            ('<<DataCalculateThresholds>>', self.show_scoring_dialog),
 
             # Help menu
-            '<<HelpREADME>>': lambda _: self._show_help(),
-            '<<HelpChangelog>>': lambda _: self._show_changelog(),
+            ('<<HelpREADME>>', self._show_help),
+            ('<<HelpChangelog>>', self._show_changelog),
 
             # Session dialog commands
-            '<<SessionSubmit>>': lambda _: self._save_sessionpars(),
+            ('<<SessionSubmit>>', self._save_sessionpars),
 
             # Calibration dialog commands
-            '<<CalPlay>>': lambda _: self.play_calibration_file(),
-            '<<CalStop>>': lambda _: self.stop_audio(),
-            '<<CalibrationSubmit>>': lambda _: self._calc_offset(),
+            ('<<CalPlay>>', self.play_calibration_file),
+            ('<<CalStop>>', self.stop_audio),
+            ('<<CalibrationSubmit>>', self._calc_offset),
 
             # Audio dialog commands
-            '<<AudioDialogSubmit>>': lambda _: self._save_sessionpars(),
+            ('<<AudioDialogSubmit>>', self._save_sessionpars),
 
             # Main View commands
-            '<<MainOne>>': lambda _: self._on_1(),
-            '<<MainTwo>>': lambda _: self._on_2(),
-            '<<MainSubmit>>': lambda _: self._on_submit(),
-        }
+            ('<<MainOne>>', self._on_1),
+            ('<<MainTwo>>', self._on_2),
+            ('<<MainSubmit>>', self._on_submit),
+        )
 
         # Bind callbacks to sequences
-        for sequence, callback in event_callbacks.items():
-            self.bind(sequence, callback)
+        # (m=m captures each bound method once)
+        for sequence, m in bindings:
+            self.bind(sequence, lambda _e, m=m: m())
 
         """ Temporarily disable help menu until ready. """
         #self.menu.help_menu.entryconfig('README...', state='disabled')
@@ -175,41 +270,13 @@ class Application(tk.Tk):
         # Center main window
         self.center_window()
 
-        # # Check for updates
-        # if (self.sessionpars['check_for_updates'].get() == 'yes') and \
-        # (self.sessionpars['config_file_status'].get() == 1):
-        #     _filepath = self.sessionpars['version_lib_path'].get()
-        #     u = versionmodel.VersionChecker(_filepath, self.NAME, self.VERSION)
-        #     if u.status == 'mandatory':
-        #         messagebox.showerror(
-        #             title="New Version Available",
-        #             message="A mandatory update is available. Please install " +
-        #                 f"version {u.new_version} to continue.",
-        #             detail=f"You are using version {u.app_version}, but " +
-        #                 f"version {u.new_version} is available."
-        #         )
-        #         self.destroy()
-        #     elif u.status == 'optional':
-        #         messagebox.showwarning(
-        #             title="New Version Available",
-        #             message="An update is available.",
-        #             detail=f"You are using version {u.app_version}, but " +
-        #                 f"version {u.new_version} is available."
-        #         )
-        #     elif u.status == 'current':
-        #         pass
-        #     elif u.status == 'app_not_found':
-        #         messagebox.showerror(
-        #             title="Update Check Failed",
-        #             message="Cannot retrieve version number!",
-        #             detail=f"'{self.NAME}' does not exist in the version library."
-        #          )
-        #     elif u.status == 'library_inaccessible':
-        #         messagebox.showerror(
-        #             title="Update Check Failed",
-        #             message="The version library is unreachable!",
-        #             detail="Please check that you have access to Starfile."
-        #         )
+        # Render help files while idle
+        self.after_idle(self._render_help_files)
+
+        # Check for updates once the main window has been drawn
+        # (currently disabled)
+        #self.after_idle(self._check_updates)
+
 
     #####################
     # General Functions #
@@ -217,15 +284,41 @@ class Application(tk.Tk):
     def center_window(self):
         """ Center the root window. """
         self.update_idletasks()
-        screen_width = self.winfo_screenwidth()
-        screen_height = self.winfo_screenheight()
-        size = tuple(int(_) for _ in self.geometry().split('+')[0].split('x'))
-        x = screen_width/2 - size[0]/2
-        y = screen_height/2 - size[1]/2
-        self.geometry("+%d+%d" % (x, y))
+        w = self.winfo_reqwidth()
+        h = self.winfo_reqheight()
+        x = (self.winfo_screenwidth() - w) // 2
+        y = (self.winfo_screenheight() - h) // 2
+        self.geometry(f"+{x}+{y}")
         self.deiconify()
 
 
+    def _check_updates(self):
+        """ Check the version library for updates. """
+        if (self.sessionpars['check_for_updates'].get() == 'yes') and \
+        (self.sessionpars['config_file_status'].get() == 1):
+            _filepath = self.sessionpars['version_lib_path'].get()
+            u = versionmodel.VersionChecker(_filepath, self.NAME, self.VERSION)
+            self._handle_version(u)
+
+
+    def _handle_version(self, u):
+        """ Display the message for the version check status. 
+            Destroy the app if the update is mandatory.
+        """
+        h = _VERSION_HANDLERS.get(u.status)
+        if h:
+            kind, title, message, detail = h
+            show = messagebox.showerror if kind == 'error' \
+                else messagebox.showwarning
+            show(
+                title=title,
+                message=message.format(u=u, name=self.NAME),
+                detail=detail.format(u=u, name=self.NAME)
+            )
+        if u.status == 'mandatory':
+            self.destroy()
+
+
     def _progress_bar(self):
         """ Create and position task progress bar. The progress 
         bar updates based on the number of frequencies 
@@ -253,7 +346,11 @@ class Application(tk.Tk):
 
 
     def _quit(self):
-        """ Exit the application. """
+        """ Write any buffered records and exit the application. """
+        self._flush_rows()
+        self.csvmodel.close()
+        if self._sessionpars_dirty:
+            self._save_sessionpars()
         self.destroy()
 
 
@@ -272,6 +369,10 @@ class Application(tk.Tk):
         """
         # Check for first run
         if self._first_run_flag:
+            # Do not start with unparseable session parameters
+            if not self._check_sessionpars():
+                return
+
             # Disable "Start Task" from File menu
             self.menu.file_menu.entryconfig('Start Task', state='disabled')
 
@@ -279,19 +380,47 @@ class Application(tk.Tk):
             # Query AFTER the task starts to capture updates to sessioninfo
             self.freqs, self.NUM_FREQS = self.stim_model.get_test_freqs()
 
+            # Synthesize every test frequency's stimulus once, up front
+            self._stimuli = self.stim_model.create_stimulus_dict(
+                dur=self.sessionpars['duration'].get(),
+                fs=self.FS,
+                freqs=self.freqs,
+                mod_rate=5,
+                mod_depth=5
+            )
+
+            # Staircase settings are the same for every frequency
+            # (step sizes are parsed when sessionpars are loaded/saved)
+            self._stair_cfg = dict(
+                start_val=self.sessionpars['starting_level'].get(),
+                step_sizes=self._parsed_step_sizes,
+                nUp=1,
+                nDown=2,
+                nTrials=0,
+                nReversals=self.sessionpars['num_reversals'].get(),
+                rapid_descend=self.sessionpars['rapid_descend_bool'].get(),
+                min_val=self.sessionpars['min_level'].get(),
+                max_val=self.sessionpars['max_level'].get()
+            )
+
             # Set first run flag to False
             self._first_run_flag = False
             
+        # Write buffered records at each frequency boundary
+        if not self._flush_rows():
+            self.destroy()
+            return
+
         # Get next frequency or end
         try:
             self.current_freq = self.freqs.pop(0)
-            print(f"\ncontroller: Testing {self.current_freq} Hz")
+            log.info("Testing %s Hz", self.current_freq)
             messagebox.showinfo(
                 title="Ready",
                 message="When you are ready, close this window to continue."
             )
         except IndexError:
-            print(f"\ncontroller: Session ended by start_new_run")
+            log.info("Session ended by start_new_run")
             messagebox.showinfo(
                 title="Task Complete",
                 message="You have finished this task. Please let the "
@@ -300,35 +429,15 @@ class Application(tk.Tk):
             self._quit()
             return
 
-        # Generate stimulus
-        self.stim = self.stim_model.create_stimulus(
-            dur=self.sessionpars['duration'].get(),
-            fs=self.FS,
-            fc=self.current_freq,
-            mod_rate=5,
-            mod_depth=5
-        )
+        # Get precomputed stimulus
+        self.stim = self._stimuli[self.current_freq]
 
         # Update progress bar
         if self.progress_bar['value'] < 100:
             self.progress_bar['value'] += 100/self.NUM_FREQS
 
-        # Convert step_sizes to list of ints
-        steps = self.sessionpars['step_sizes'].get()
-        steps = [int(val) for val in steps.split(', ')]
-
         # Create staircase
-        self.staircase = staircase.Staircase(
-            start_val=self.sessionpars['starting_level'].get(),
-            step_sizes=steps,
-            nUp=1,
-            nDown=2,
-            nTrials=0,
-            nReversals=self.sessionpars['num_reversals'].get(),
-            rapid_descend=self.sessionpars['rapid_descend_bool'].get(),
-            min_val=self.sessionpars['min_level'].get(),
-            max_val=self.sessionpars['max_level'].get()
-        )
+        self.staircase = staircase.Staircase(**self._stair_cfg)
 
         # Start first trial
         self._new_trial()
@@ -349,16 +458,13 @@ class Application(tk.Tk):
 
         # Print message to console
         self.msg = f"Trial {self.trial}: {self.current_freq} Hz"
-        print('')
-        print('*' * 60)
-        print(self.msg)
-        print('*' * 60)
+        log.info(self.msg)
 
         # Assign stimulus to an interval
         self.stim_interval = self.stim_model.assign_stimulus_interval(
             intervals=self.INTERVALS
         )
-        print(f"controller: Stimulus is in interval {self.stim_interval}")
+        log.debug("Stimulus is in interval %s", self.stim_interval)
 
         # Calculate the RETSPL-adjusted, single channel level
         final_single_chan_level = self.stim_model.calc_presentation_lvl(
@@ -376,39 +482,52 @@ class Application(tk.Tk):
         # print(f"Scaled final single chan level: " +
         #       f"{self.sessionpars['adjusted_level_dB'].get()}")
 
-        # Pause
-        time.sleep(1) # Was 0.5 seconds
-        
-        # Interval 1
+        # Read trial parameters once (after _calc_level has updated
+        # the adjusted level) and pass them to each stage
+        lvl = self.sessionpars['adjusted_level_dB'].get()
+        dur_ms = int((self.sessionpars['duration'].get() + 0.15) * 1000)
+
+        # Pause, then start interval 1 without blocking the event loop
+        self.after(1000, self._trial_stage_1_start, lvl, dur_ms) # Was 0.5 s
+
+
+    def _trial_stage_1_start(self, lvl, dur_ms):
+        """ Light interval 1 and present the stimulus if assigned. """
         self.main_frame.interval_1_colors()
         if self.stim_interval == 1:
             self.present_audio(
                 audio=self.stim,
-                pres_level=self.sessionpars['adjusted_level_dB'].get(),
+                pres_level=lvl,
                 sampling_rate=self.FS
             )
-        time.sleep(self.sessionpars['duration'].get() + 0.15)
+        self.after(dur_ms, self._trial_isi, lvl, dur_ms)
+
 
-        # ISI
+    def _trial_isi(self, lvl, dur_ms):
+        """ Clear interval colors for the inter-stimulus interval. """
         self.main_frame.clear_interval_colors()
-        time.sleep(0.5)
+        self.after(500, self._trial_stage_2_start, lvl, dur_ms)
+
 
-        # Interval 2
+    def _trial_stage_2_start(self, lvl, dur_ms):
+        """ Light interval 2 and present the stimulus if assigned. """
         self.main_frame.interval_2_colors()
         if self.stim_interval == 2:
             self.present_audio(
                 audio=self.stim,
-                pres_level=self.sessionpars['adjusted_level_dB'].get(),
+                pres_level=lvl,
                 sampling_rate=self.FS
             )
-        time.sleep(self.sessionpars['duration'].get() + 0.15)
+        self.after(dur_ms, self._trial_end)
 
-        # End
+
+    def _trial_end(self):
+        """ Clear interval colors and bind response keys. """
         self.main_frame.clear_interval_colors()
 
-        # Wait to bind keys until after trial has finished
+        # Bind keys only after the trial has finished
         #   to avoid multiple submissions during the presentation
-        self.after(10, lambda: self.bind_keys())
+        self.bind_keys()
 
 
     #####################
@@ -432,16 +551,18 @@ class Application(tk.Tk):
         # Grab the current staircase level before it updates
         self.sessionpars['current_stair_level'].set(self.staircase.current_level)
 
-        # Assign response value
-        if (self.response == 1) and (self.stim_interval == 1):
-            self.staircase.add_response(1)
-        elif (self.response == 2) and (self.stim_interval == 2):
-            self.staircase.add_response(1)
-        else: 
-            self.staircase.add_response(-1)
+        # Assign response value: correct if the response matches the
+        # stimulus interval (no response scores as incorrect)
+        self.staircase.add_response(
+            1 if self.response == self.stim_interval else -1)
+
+        # Save the trial data (stop if the app was closed on failure)
+        if not self._save_trial_data():
+            return
 
-        # Save the trial data
-        self._save_trial_data()
+        # Write any deferred sessionpars changes
+        if self._sessionpars_dirty:
+            self._save_sessionpars()
 
         # Update trial counter
         self.trial += 1
@@ -451,7 +572,7 @@ class Application(tk.Tk):
 
         # Check for end of staircase
         if not self.staircase.status:
-            print(f"\ncontroller: End of staircase!")
+            log.info("End of staircase!")
             if self.sessionpars['disp_plots'].get() == 1:
                 self.staircase.plot_data()
             # Call start_new_run to get next frequency
@@ -461,11 +582,13 @@ class Application(tk.Tk):
 
 
     def _save_trial_data(self):
-        """ Select data to save and write to CSV. """
+        """ Select data to save and write to CSV. 
+        
+            Returns: False if the records could not be written (the
+            app has been destroyed)
+        """
         # Get tk variable values
-        converted = dict()
-        for key in self.sessionpars:
-            converted[key] = self.sessionpars[key].get()
+        converted = self._snapshot_sessionpars()
 
         # Add most recent datapoint object attributes to dict
         converted.update(self.staircase.dw.datapoints[-1].__dict__)
@@ -483,43 +606,66 @@ class Application(tk.Tk):
         entered_lvl = converted['desired_level_dB']
         converted['calculated_oal'] = np.round(10 * np.log10(chans) + entered_lvl, 1)
 
-        # Define selected items for writing to file
-        save_list = [
-            'trial', 'subject', 'condition', 'min_level', 'max_level', 
-            'duration', 'step_sizes', 'num_reversals', 'rapid_descend', 
-            'num_stim_chans', 'slm_reading', 
-            'cal_level_dB', 'slm_offset', 'adjusted_level_dB', 
-            'desired_level_dB', 'current_stair_level', 'calculated_oal', 
-            'test_freq', 'response', 'reversal'
-        ]
-
         # Create new dict with desired items
-        try:
-            data = dict((k, converted[k]) for k in save_list)
-        except KeyError as e:
-            print('\ncontroller: Unexpected variable when attempting ' +
-                  f'to save: {e}')
+        # (keys are validated at startup by _validate_save_keys)
+        data = dict(zip(self._SAVE_KEYS, self._SAVE_GETTER(converted)))
+
+        # Buffer record and write to file every _FLUSH_EVERY trials
+        self._pending_rows.append(data)
+        if len(self._pending_rows) >= self._FLUSH_EVERY:
+            if not self._flush_rows():
+                self.destroy()
+                return False
+        return True
+
+
+    def _flush_rows(self):
+        """ Write buffered trial records to CSV. The records are
+            kept until they are written, so the user can close the
+            file and retry.
+        
+            Returns: False if the records could not be written
+        """
+        if not self._pending_rows:
+            return True
+
+        log.debug("Attempting to save records")
+        while True:
+            try:
+                self.csvmodel.save_records(
+                    self._pending_rows, self._SAVE_KEYS)
+            except PermissionError as e:
+                log.error(e)
+                if messagebox.askretrycancel(
+                    title="Access Denied",
+                    message="Data not saved! Cannot write to file!",
+                    detail=f"{e}\n\nClose the file and click Retry."
+                ):
+                    continue
+                return False
+            # Clear only after a successful write
+            self._pending_rows.clear()
+            return True
+
+
+    def _validate_save_keys(self):
+        """ Check that every key in _SAVE_KEYS is a session parameter,
+            a DataPoint attribute, or added in _save_trial_data.
+            Returns False (after telling the user) if any are missing.
+        """
+        available = set(self.sessionpars_model.fields) \
+            | set(vars(staircase.DataPoint())) \
+            | {'trial', 'test_freq', 'calculated_oal'}
+        missing = [k for k in self._SAVE_KEYS if k not in available]
+        if missing:
+            log.error("Undefined variable(s) in save list: %s", missing)
             messagebox.showerror(
                 title="Undefined Variable",
-                message="Data not saved!",
-                detail=f'{e} is undefined.'
-            )
-            self.destroy()
-            return
-
-        # Write data to file
-        print('\ncontroller: Attempting to save record')
-        try:
-            self.csvmodel.save_record(data)
-        except PermissionError as e:
-            print(e)
-            messagebox.showerror(
-                title="Access Denied",
-                message="Data not saved! Cannot write to file!",
-                detail=e
+                message="Data cannot be saved!",
+                detail=f'{", ".join(missing)} undefined.'
             )
-            self.destroy()
-            return
+            return False
+        return True
 
 
     ############################
@@ -527,35 +673,110 @@ class Application(tk.Tk):
     ############################
     def _show_session_dialog(self):
         """ Show session parameter dialog. """
-        print("\ncontroller: Calling session dialog...")
-        self.update_idletasks()
-        sessionview.SessionDialog(self, self.sessionpars)
+        log.debug("Calling session dialog...")
+        # Build the dialog once and reuse it on later openings
+        if self._session_dialog is None:
+            from views import sessionview
+            self._session_dialog = sessionview.SessionDialog(
+                self, self.sessionpars)
+        else:
+            self._session_dialog.show()
 
 
     def _load_sessionpars(self):
         """ Load parameters into self.sessionpars dict. """
-        vartypes = {
-        'bool': tk.BooleanVar,
-        'str': tk.StringVar,
-        'int': tk.IntVar,
-        'float': tk.DoubleVar
+        # Create runtime dict from session model fields
+        self.sessionpars = {
+            key: self._VARTYPES.get(data['type'], tk.StringVar)(
+                value=data['value'])
+            for key, data in self.sessionpars_model.fields.items()
         }
+        log.debug("Loaded sessionpars model fields into running " +
+            "sessionpars dict")
 
-        # Create runtime dict from session model fields
-        self.sessionpars = dict()
-        for key, data in self.sessionpars_model.fields.items():
-            vartype = vartypes.get(data['type'], tk.StringVar)
-            self.sessionpars[key] = vartype(value=data['value'])
-        print("\ncontroller: Loaded sessionpars model fields into " +
-            "running sessionpars dict")
+        # Parse string parameters once (never fatal: a malformed
+        #   value may already be on disk)
+        self._parsed_step_sizes = ()
+        self._parsed_routing = []
+        self._parsed_raw = None
+        self._bad_raw = None
+        self._sessionpars_valid = False
+        self._check_sessionpars()
+
+
+    def _snapshot_sessionpars(self):
+        """ Return a dict of the current tk variable values. """
+        return {key: var.get() for key, var in self.sessionpars.items()}
+
+
+    def _save_sessionpars(self, *_, defer=False):
+        """ Save current runtime parameters to file. 
+            With defer=True, only mark the parameters as dirty; 
+            they are written by the next non-deferred save.
+        """
+        if defer:
+            self._sessionpars_dirty = True
+            return
+
+        # Never write values that cannot be parsed: keep them pending
+        #   until they are corrected
+        if not self._check_sessionpars():
+            self._sessionpars_dirty = True
+            return
+
+        log.debug("Calling sessionpars model set and save funcs")
+        self._sessionpars_dirty = False
+        snap = self._snapshot_sessionpars()
+        for key, value in snap.items():
+            self.sessionpars_model.set(key, value)
+        self.sessionpars_model.save()
+
+
+    def _check_sessionpars(self):
+        """ Parse string parameters, showing an error (once per bad
+            value) instead of raising. The last good values are kept
+            on failure. Returns True if the parameters are valid.
+        """
+        valid = self._parse_sessionpars()
+        if valid:
+            self._bad_raw = None
+        elif self._parsed_raw != self._bad_raw:
+            self._bad_raw = self._parsed_raw
+            log.error("Invalid step sizes or channel routing")
+            messagebox.showerror(
+                title="Invalid Parameters",
+                message="Invalid step sizes or channel routing!",
+                detail="Step sizes must be integers (File>Session) and " +
+                    "routing must be channel numbers separated by " +
+                    "spaces (Tools>Audio Settings). Changes will not " +
+                    "be saved until these are corrected."
+            )
+        self._sessionpars_valid = valid
+        return valid
 
 
-    def _save_sessionpars(self, *_):
-        """ Save current runtime parameters to file. """
-        print("\ncontroller: Calling sessionpars model set and save funcs")
-        for key, variable in self.sessionpars.items():
-            self.sessionpars_model.set(key, variable.get())
-            self.sessionpars_model.save()
+    def _parse_sessionpars(self):
+        """ Convert string parameters to tuples/lists of ints so the
+            trial path does not re-parse them. Skipped when the raw
+            strings have not changed. Returns True on success.
+        """
+        raw = (
+            self.sessionpars['step_sizes'].get(),
+            self.sessionpars['channel_routing'].get()
+        )
+        if raw == self._parsed_raw:
+            return self._sessionpars_valid
+        self._parsed_raw = raw
+
+        try:
+            step_sizes = tuple(int(x) for x in
+                raw[0].replace(',', ' ').split())
+            routing = self._format_routing(raw[1])
+        except ValueError:
+            return False
+        self._parsed_step_sizes = step_sizes
+        self._parsed_routing = routing
+        return True
 
 
     ########################
@@ -563,12 +784,14 @@ class Application(tk.Tk):
     ########################
     def _show_audio_dialog(self):
         """ Show audio settings dialog. """
-        print("\ncontroller: Calling audio dialog")
+        log.debug("Calling audio dialog")
+        from views import audioview
         audioview.AudioDialog(self, self.sessionpars)
 
     def _show_calibration_dialog(self):
         """ Display the calibration dialog window. """
-        print("\ncontroller: Calling calibration dialog")
+        log.debug("Calling calibration dialog")
+        from views import calibrationview
         calibrationview.CalibrationDialog(self, self.sessionpars)
 
 
@@ -577,7 +800,8 @@ class Application(tk.Tk):
     #######################
     def show_scoring_dialog(self):
         """ Display the threshold calculation dialog. """
-        print("\ncontroller: Calling threshold dialog")
+        log.debug("Calling threshold dialog")
+        from views import dataview
         dataview.ThresholdDialog(self)
 
 
@@ -614,42 +838,58 @@ class Application(tk.Tk):
         """ Calculate new dB FS level using slm_offset. """
         # Calculate new presentation level
         self.calmodel.calc_level(desired_spl)
-        # Save level - this must be called here!
-        self._save_sessionpars()
+        # Mark level for saving - written once per trial in _on_submit
+        self._save_sessionpars(defer=True)
 
 
     #######################
     # Help Menu Functions #
     #######################
+    def _ensure_html(self, md_path, html_path):
+        """ Convert markdown file to html, only if the html file is 
+            missing or older than the markdown file.
+        """
+        md_mtime = os.path.getmtime(md_path)
+        try:
+            html_mtime = os.path.getmtime(html_path)
+        except OSError:
+            html_mtime = -1
+
+        if md_mtime > html_mtime:
+            import markdown
+
+            # Read markdown file and convert to html
+            with open(md_path, 'r') as f:
+                html = markdown.markdown(f.read())
+
+            # Create html file for display
+            with open(html_path, 'w') as f:
+                f.write(html)
+
+
+    def _render_help_files(self):
+        """ Make sure the README and CHANGELOG html files are current. """
+        self._ensure_html(README.README_MD, README.README_HTML)
+        self._ensure_html(README.CHANGELOG_MD, README.CHANGELOG_HTML)
+
+
     def _show_help(self):
         """ Create html README file and display in browser. """
-        print(f"\ncontroller: Calling README file (will open in browser)")
-        # Read markdown file and convert to html
-        with open(README.README_MD, 'r') as f:
-            text = f.read()
-            html = markdown.markdown(text)
-
-        # Create html file for display
-        with open(README.README_HTML, 'w') as f:
-            f.write(html)
+        log.debug("Calling README file (will open in browser)")
+        self._ensure_html(README.README_MD, README.README_HTML)
 
         # Open README in default web browser
+        import webbrowser
         webbrowser.open(README.README_HTML)
 
 
     def _show_changelog(self):
         """ Create html CHANGELOG file and display in browser. """
-        print(f"\ncontroller: Calling CHANGELOG file (will open in browser)")
-        # Read markdown file and convert to html
-        with open(README.CHANGELOG_MD, 'r') as f:
-            text = f.read()
-            html = markdown.markdown(text)
-
-        # Create html file for display
-        with open(README.CHANGELOG_HTML, 'w') as f:
-            f.write(html)
+        log.debug("Calling CHANGELOG file (will open in browser)")
+        self._ensure_html(README.CHANGELOG_MD, README.CHANGELOG_HTML)
 
-        # Open README in default web browser
+        # Open CHANGELOG in default web browser
+        import webbrowser
         webbrowser.open(README.CHANGELOG_HTML)
 
 
@@ -657,64 +897,76 @@ class Application(tk.Tk):
     # Audio Functions #
     ###################
     def present_audio(self, audio, pres_level, **kwargs):
-        """ Attempt to create and present audio object. """
-        # Load audio
+        """ Queue audio for presentation by the audio worker thread. """
+        # Tk variables must be read on the main thread
+        self._audio_q.put((
+            audio,
+            pres_level,
+            self.sessionpars['audio_device'].get(),
+            self._parsed_routing,
+            kwargs
+        ))
+
+
+    def _audio_worker(self):
+        """ Create and present audio objects from the audio queue.
+            Runs on a daemon thread: never touch Tk from here.
+            Exceptions (with the audio object that raised them, if
+            any) are passed back to the main thread.
+        """
+        while True:
+            audio, pres_level, device_id, routing, kwargs = self._audio_q.get()
+            a = None
+            try:
+                a = self._create_audio_object(audio, **kwargs)
+                self._play(a, pres_level, device_id, routing)
+            except Exception as e:
+                # Any failure must reach the user: an uncaught error
+                #   would silently end this thread (and all playback)
+                self._audio_err_q.put((e, a))
+
+
+    def _drain_audio_errs(self):
+        """ Poll the audio error queue and display any errors 
+            raised by the audio worker thread.
+        """
+        while True:
+            try:
+                e, a = self._audio_err_q.get_nowait()
+            except queue.Empty:
+                break
+            self._handle_audio_error(e, a)
+        self.after(50, self._drain_audio_errs)
+
+
+    def _handle_audio_error(self, e, a=None):
+        """ Display the appropriate error message for an exception
+            raised by the audio worker thread. A is the audio object
+            that raised it (None if creation failed).
+        """
         try:
-            self._create_audio_object(audio, **kwargs)
+            raise e
+        except FileNotFoundError:
+            messagebox.showerror(
+                title="File Not Found",
+                message="Cannot find the audio file!",
+                detail="Go to File>Session to specify a valid audio path."
+            )
+            self._show_session_dialog()
         except audio_exceptions.InvalidAudioType as e:
             messagebox.showerror(
                 title="Invalid Audio Type",
                 message="The audio type is invalid!",
                 detail=f"{e} Please provide a Path or ndarray object."
             )
-            return
         except audio_exceptions.MissingSamplingRate as e:
             messagebox.showerror(
                 title="Missing Sampling Rate",
                 message="No sampling rate was provided!",
                 detail=f"{e} Please provide a Path or ndarray object."
             )
-            return
-
-        # Play audio
-        self._play(pres_level)
-
-
-    def _create_audio_object(self, audio, **kwargs):
-        """ Create audio object from audiomodel. """
-        try:
-            self.a = audiomodel.Audio(
-                audio=audio,
-                **kwargs
-            )
-        except FileNotFoundError:
-            messagebox.showerror(
-                title="File Not Found",
-                message="Cannot find the audio file!",
-                detail="Go to File>Session to specify a valid audio path."
-            )
-            self._show_session_dialog()
-            return
-        except audio_exceptions.InvalidAudioType:
-            raise
-        except audio_exceptions.MissingSamplingRate:
-            raise
-
-
-    def _play(self, pres_level):
-        """ Format channel routing, present audio and catch 
-            exceptions.
-        """
-        # Attempt to present audio
-        try:
-            self.a.play(
-                level=pres_level,
-                device_id=self.sessionpars['audio_device'].get(),
-                routing=self._format_routing(
-                    self.sessionpars['channel_routing'].get())
-            )
         except audio_exceptions.InvalidAudioDevice as e:
-            print(e)
+            log.error(e)
             messagebox.showerror(
                 title="Invalid Device",
                 message="Invalid audio device! Go to Tools>Audio Settings " +
@@ -724,7 +976,7 @@ class Application(tk.Tk):
             # Open Audio Settings window
             self._show_audio_dialog()
         except audio_exceptions.InvalidRouting as e:
-            print(e)
+            log.error(e)
             messagebox.showerror(
                 title="Invalid Routing",
                 message="Speaker routing must correspond with the " +
@@ -735,14 +987,40 @@ class Application(tk.Tk):
             # Open Audio Settings window
             self._show_audio_dialog()
         except audio_exceptions.Clipping:
-            print("controller: Clipping has occurred! Aborting!")
+            log.error("Clipping has occurred! Aborting!")
             messagebox.showerror(
                 title="Clipping",
                 message="The level is too high and caused clipping.",
                 detail="The waveform will be plotted when this message is " +
                     "closed for visual inspection."
             )
-            self.a.plot_waveform("Clipped Waveform")
+            # Plot the object that clipped, not whatever self.a is now
+            a.plot_waveform("Clipped Waveform")
+        except Exception as e:
+            log.exception("Audio playback failed")
+            messagebox.showerror(
+                title="Audio Error",
+                message="Audio playback failed!",
+                detail=f"{type(e).__name__}: {e}"
+            )
+
+
+    def _create_audio_object(self, audio, **kwargs):
+        """ Create audio object from audiomodel. """
+        self.a = audiomodel.Audio(
+            audio=audio,
+            **kwargs
+        )
+        return self.a
+
+
+    def _play(self, a, pres_level, device_id, routing):
+        """ Present audio A. Exceptions are handled by the caller. """
+        a.play(
+            level=pres_level,
+            device_id=device_id,
+            routing=routing
+        )
 
 
     def stop_audio(self):
@@ -750,7 +1028,7 @@ class Application(tk.Tk):
         try:
             self.a.stop()
         except AttributeError:
-            print("\ncontroller: Stop called without audio object!")
+            log.warning("Stop called without audio object!")
 
 
     def _format_routing(self, routing):
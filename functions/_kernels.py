@@ -0,0 +1,95 @@
+""" Numba kernels for functions.general.
+
+Imported lazily by general._load_kernels, so numba's import and 
+compile time stay out of application startup. Importing this 
+module raises ImportError if numba is not installed.
+"""
+
+###########
+# Imports #
+###########
+# Standard library
+import math
+
+# Third party
+from numba import njit, prange
+
+
+###########
+# Kernels #
+###########
+# Cody-Waite split of pi/4 (cephes sin.c); 'reassoc' is left out
+# of the fastmath flags so the three-part reduction is kept
+_DP1 = 7.85398125648498535156E-1
+_DP2 = 3.77489470793079817668E-8
+_DP3 = 2.69515142907905952645E-15
+_FOUR_OVER_PI = 1.27323954473516268615
+_FASTMATH = {'nnan', 'ninf', 'nsz', 'arcp', 'contract'}
+
+@njit(inline='always', fastmath=_FASTMATH)
+def _fast_sin(x):
+    """ Polynomial sine: reduce X to [-pi/4, pi/4] and evaluate 
+        the cephes sin/cos minimax polynomials in Horner form.
+    """
+    sign = 1.0
+    if x < 0.0:
+        x = -x
+        sign = -1.0
+    # Octant, rounded up to an even count of pi/4
+    j = int(x * _FOUR_OVER_PI)
+    j += j & 1
+    q = float(j)
+    z = ((x - q*_DP1) - q*_DP2) - q*_DP3
+    # Quadrant correction from the octant bits
+    j &= 7
+    if j > 3:
+        sign = -sign
+        j -= 4
+    zz = z * z
+    if j == 2:
+        y = 1.0 - 0.5*zz + zz*zz*(4.16666666666665929218E-2
+            + zz*(-1.38888888888730564116E-3
+            + zz*(2.48015872888517045348E-5
+            + zz*(-2.75573141792967388112E-7
+            + zz*(2.08757008419747316778E-9
+            + zz*(-1.13585365213876817300E-11))))))
+    else:
+        y = z + z*zz*(-1.66666666666666307295E-1
+            + zz*(8.33333333332211858878E-3
+            + zz*(-1.98412698295895385996E-4
+            + zz*(2.75573136213857245213E-6
+            + zz*(-2.50507477628578072866E-8
+            + zz*1.58962301576546568060E-10)))))
+    return sign * y
+
+# Compiled when this module is imported (on first use, see 
+# general._load_kernels) from the explicit signature, and cached to 
+# disk. Phases are float64; only the stored samples are float32.
+@njit('void(float32[:], float64, float64, float64, float64, float64)',
+      cache=True, fastmath=_FASTMATH, parallel=True)
+def warble_kernel(y, inv_fs, wc, wd, B_over_wd, phi):
+    """ Write a warble tone into Y in a single fused loop. """
+    for i in prange(y.shape[0]):
+        ti = i * inv_fs
+        y[i] = _fast_sin(wc * ti + B_over_wd * (_fast_sin(wd * ti - phi) + 1.0))
+
+# Reference kernel using libm sin, for accuracy checks only: no 
+# signature, so it is not compiled unless check_accuracy is used
+@njit(cache=True, parallel=True)
+def warble_kernel_ref(y, inv_fs, wc, wd, B_over_wd, phi):
+    """ Write a warble tone into Y using math.sin. """
+    for i in prange(y.shape[0]):
+        ti = i * inv_fs
+        y[i] = math.sin(wc * ti + B_over_wd * (math.sin(wd * ti - phi) + 1.0))
+
+@njit('void(float32[:, :], float64, float64[:], float64, float64[:], '
+      'float64[:])', cache=True, fastmath=_FASTMATH, parallel=True)
+def warble_batch_kernel(Y, inv_fs, wcs, wd, B_over_wds, phis):
+    """ Write one warble tone per row of Y. """
+    for k in range(Y.shape[0]):
+        wc = wcs[k]
+        b = B_over_wds[k]
+        phi = phis[k]
+        for i in prange(Y.shape[1]):
+            ti = i * inv_fs
+            Y[k, i] = _fast_sin(wc * ti + b * (_fast_sin(wd * ti - phi) + 1.0))
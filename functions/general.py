@@ -8,18 +8,33 @@ Last edited: July 17, 2024
 # Imports #
 ###########
 # Standard library
+import functools
 import os
 import sys
 
 # Third party
 import numpy as np
-#import scipy.signal as s
-#from matplotlib import pyplot as plt
 
 
 #########
 # Funcs #
 #########
+@functools.lru_cache(maxsize=None)
+def _load_kernels():
+    """ Import the numba kernels module on first use (compiling 
+        the kernels or loading them from the disk cache), keeping 
+        numba out of application startup.
+
+        Returns: the functions._kernels module, or None if numba 
+            is not installed (NumPy fallbacks are used)
+    """
+    try:
+        from functions import _kernels
+    except ImportError:
+        return None
+    return _kernels
+
+
 def resource_path(relative_path):
     """ Create the absolute path to compiled resources. """
     try:
@@ -31,28 +46,28 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-def truncate_path(long_path, **kwargs):
+def truncate_path(long_path, length=60):
     """ Truncate path (if necessary) and return shortened 
         path for display.
     """
-    # Check for custom length argument
-    if 'length' in kwargs:
-        length = kwargs['length']
-    else:
-        length = 60
-
+    if not long_path:
+        return 'Please select a file'
     # Truncate path based on length
     if len(long_path) >= length:
-        short = '...' + long_path[-(length-5):]
-        return short
-    else:
-        if long_path == "":
-            return 'Please select a file'
-        else:
-            return long_path
+        return '...' + long_path[-(length-5):]
+    return long_path
+
+
+def time_base(dur, fs):
+    """ Return a time vector of round(DUR*FS) samples, 
+        starting at 0 and spaced 1/FS seconds apart.
+    """
+    # Integer sample index, scaled once: exact length, no float steps
+    return np.arange(int(round(dur*fs))) * (1/fs)
 
 
-def warble_tone(dur, fs, fc, phi, mod_rate, mod_depth):
+def warble_tone(dur, fs, fc, phi, mod_rate, mod_depth, out=None,
+                check_accuracy=False):
     """ Create a warble tone. 
 
         Parameters:
@@ -62,44 +77,126 @@ def warble_tone(dur, fs, fc, phi, mod_rate, mod_depth):
             phi: starting phase in radians
             mod_rate: modulation rate in percent
             mod_depth: modulation depth in percent
+            out: optional float32 array to write the tone into 
+                (must match the length of the time vector)
+            check_accuracy: use the math.sin reference kernel 
+                instead of the polynomial sine (for validation)
 
-        Returns: a single-channel warble tone
+        Returns: a single-channel float32 warble tone
         
         Example:
-            warble = _warble_tone(3, 44100, 1000, 0, 5, 5)
+            warble = warble_tone(3, 44100, 1000, 0, 5, 5)
 
         Written by: Travis M. Moore
         Created: 12/01/2023
         Last edited: 02/29/2024
     """
-    # Create time vector
-    t = np.arange(0, dur, 1/fs)
-
     # Synthesize warble tone
     wc = fc * 2 * np.pi
     wd = mod_rate * 2 * np.pi
     B = (mod_depth / 100) * wc # in radians
-    #y = np.sin(wc * t + (B/wd) * (np.sin(wd * t - (np.pi/2)) + 1)) #static phi
-    y = np.sin(wc * t + (B/wd) * (np.sin(wd * t - phi) + 1))
-
-    # # Plot spectrogram of y
-    # plt.figure()
-    # f, t, Sxx = s.spectrogram(y, fs, nperseg=1024)
-    # plt.pcolormesh(t, f, 10 * np.log10(Sxx))
-    # plt.title('Spectrogram')
-    # plt.xlabel('Time (s)')
-    # plt.ylabel('Frequency (Hz)')
-    # plt.show()
+
+    # Use fused compiled kernel, if available
+    kernels = _load_kernels()
+    if kernels is not None:
+        # Same number of samples as time_base(dur, fs)
+        n = int(round(dur*fs))
+        y = np.empty(n, dtype=np.float32) if out is None else out
+        if check_accuracy:
+            kernels.warble_kernel_ref(y, 1/fs, wc, wd, B/wd, phi)
+        else:
+            kernels.warble_kernel(y, 1/fs, wc, wd, B/wd, phi)
+        return y
+
+    # Create time vector
+    t = time_base(dur, fs)
+
+    # y = sin(wc*t + (B/wd) * (sin(wd*t - phi) + 1)), computed in place
+    # (float64 phase; the final sine is written as float32)
+    phase = np.multiply(t, wd)
+    phase -= phi
+    np.sin(phase, out=phase)
+    phase += 1
+    phase *= B/wd
+    t *= wc
+    phase += t
+    y = np.empty(t.size, dtype=np.float32) if out is None else out
+    np.sin(phase, out=y)
 
     return y
 
 
+def warble_tone_batch(dur, fs, fcs, phis, mod_rate, mod_depth):
+    """ Create N warble tones in one pass. 
+
+        Parameters:
+            dur: duration in seconds
+            fs: sampling rate in Hz
+            fcs: (N,) center frequencies of the warble tones
+            phis: (N,) starting phases in radians
+            mod_rate: modulation rate in percent
+            mod_depth: modulation depth in percent
+
+        Returns: an (N, samples) float32 array with one warble 
+            tone per row
+        
+        Example:
+            warbles = warble_tone_batch(3, 44100, [1000, 1000], 
+                np.radians([140, 120]), 5, 5)
+    """
+    # Writable float64 copies (the compiled signature rejects 
+    # read-only arrays)
+    fcs = np.array(fcs, dtype=np.float64)
+    phis = np.array(phis, dtype=np.float64)
+
+    # Synthesis constants, one per tone
+    wcs = fcs * 2 * np.pi
+    wd = mod_rate * 2 * np.pi
+    B_over_wds = (mod_depth / 100) * wcs / wd
+
+    # Use fused compiled kernel, if available
+    kernels = _load_kernels()
+    if kernels is not None:
+        Y = np.empty((fcs.size, int(round(dur*fs))), dtype=np.float32)
+        kernels.warble_batch_kernel(Y, 1/fs, wcs, wd, B_over_wds, phis)
+        return Y
+
+    # Broadcast the shared time vector against per-tone constants:
+    # Y = sin(wc*t + (B/wd) * (sin(wd*t - phi) + 1))
+    t = time_base(dur, fs)
+    Y = np.empty((fcs.size, t.size))
+    np.multiply(t, wd, out=Y)
+    Y -= phis[:, None]
+    np.sin(Y, out=Y)
+    Y += 1
+    Y *= B_over_wds[:, None]
+    # Add each carrier phase through one reused row buffer
+    # rather than a second (N, samples) temporary. Here phi sits 
+    # in the modulator, so channels sharing a center frequency 
+    # share the carrier phase wc*t: compute it once for all of them.
+    if np.all(wcs == wcs[0]):
+        Y += t * wcs[0]
+    else:
+        carrier = np.empty_like(t)
+        for row, wc in zip(Y, wcs):
+            np.multiply(t, wc, out=carrier)
+            row += carrier
+
+    # Phases are float64; store the samples as float32 (out= keeps
+    # the float64 sine loop, where dtype= would cast the phases)
+    out = np.empty(Y.shape, dtype=np.float32)
+    np.sin(Y, out=out)
+
+    return out
+
+
 def doGate(sig, rampdur=0.02, fs=48000):
     """ Apply rising and falling ramps to signal SIG, of 
         duration RAMPDUR. Takes a 1-channel or 2-channel 
         signal. 
 
-            SIG: a 1-channel or 2-channel signal
+            SIG: a 1-channel signal, or a 2-channel signal 
+                of shape (2, samples)
             RAMPDUR: duration of one side of the gate in 
                 seconds
             FS: sampling rate in samples/second
@@ -112,26 +209,30 @@ def doGate(sig, rampdur=0.02, fs=48000):
         Adapted by: Travis M. Moore
         Last edited: Jan. 13, 2022          
     """
-    gate =  np.cos(np.linspace(np.pi, 2*np.pi, int(fs*rampdur)))
-    # Adjust envelope modulator to be within +/-1
-    gate = gate + 1 # translate modulator values to the 0/+2 range
-    gate = gate/2 # compress values within 0/+1 range
-    # Create offset gate by flipping the array
-    offsetgate = np.flip(gate)
-    # Check number of channels in signal
-    if len(sig.shape) == 1:
-        # Create "sustain" portion of envelope
-        sustain = np.ones(len(sig)-(2*len(gate)))
-        envelope = np.concatenate([gate, sustain, offsetgate])
-        gated = envelope * sig
-    elif len(sig.shape) == 2:
-        # Create "sustain" portion of envelope
-        sustain = np.ones(len(sig[0])-(2*len(gate)))
-        envelope = np.concatenate([gate, sustain, offsetgate])
-        gatedLeft = envelope * sig[0]
-        gatedRight = envelope * sig[1]
-        gated = np.array([gatedLeft, gatedRight])
-    return gated
+    # Envelope is cached per signal length, ramp length and (float) 
+    # dtype, so float32 signals stay float32
+    envelope = _gate_envelope(sig.shape[-1], int(fs*rampdur), 
+        np.result_type(sig.dtype, np.float32))
+    # Broadcasts along the last axis, so both rows of a 2-channel 
+    # signal are gated in one multiply without re-packing
+    return envelope * sig
+
+
+@functools.lru_cache(maxsize=32)
+def _gate_envelope(n, ramp_samples, dtype=np.float64):
+    """ Return a read-only gating envelope of N samples with 
+        raised-cosine ramps of RAMP_SAMPLES at each end.
+    """
+    env = np.ones(n, dtype=dtype)
+    if ramp_samples:
+        # Hann half-window onset; the offset is a reversed view
+        ramp_up = np.cos(np.linspace(0, np.pi, ramp_samples))
+        ramp_up *= -0.5
+        ramp_up += 0.5
+        env[:ramp_samples] = ramp_up
+        env[-ramp_samples:] = ramp_up[::-1]
+    env.setflags(write=False)
+    return env
 
 
 def mkTone(freq, dur, phi=0, fs=48000):
@@ -149,8 +250,11 @@ def mkTone(freq, dur, phi=0, fs=48000):
     Last edited: 1/12/2022
     """
     phi = np.deg2rad(phi) # to radians
-    t = np.arange(0,dur,1/fs) # time base
-    sig = np.sin(2*np.pi*freq*t+phi)
+    t = time_base(dur, fs) # time base
+    # Build the phase in one buffer and take the sine in place
+    sig = np.multiply(t, 2*np.pi*freq)
+    sig += phi
+    np.sin(sig, out=sig)
     return [t, sig]
 
 
@@ -160,7 +264,8 @@ def string_to_list(string):
         Expects: a string of comma-separated integers
         Returns: a list of integers
     """
-    my_list = [int(val) for val in string.split(', ')]
+    # Parse in C; surrounding spaces are accepted by the int cast
+    my_list = np.asarray(string.split(','), dtype=np.int32).tolist()
     return my_list
 
 
@@ -168,37 +273,31 @@ def deg2rad(deg):
     """ Convert degrees to radians. Takes a single
         value or a list of values.
     """
-    try:
-        rads = [np.radians(x) for x in deg]
-        return rads
-    except:
-        rads = np.radians(deg)
-        return rads
+    return np.radians(np.asarray(deg))
     
 
 def db2mag(db):
     """ Convert decibels to magnitude. Takes a single
         value or a list of values.
     """
-    # Must use this form to handle negative db values!
-    try:
-        mag = [10**(x/20) for x in db]
-        return mag
-    except:
-        mag = 10**(db/20)
-        return mag
+    # Scalar levels repeat within a session, so memoize them
+    if np.ndim(db) == 0:
+        return _db2mag_scalar(float(db))
+    # Float exponent handles negative db values
+    return np.power(10.0, np.asarray(db) / 20.0)
+
+
+@functools.lru_cache(maxsize=256)
+def _db2mag_scalar(db):
+    """ Convert a single decibel value to magnitude. """
+    return 10.0**(db/20.0)
 
 
 def mag2db(mag):
     """ Convert magnitude to decibels. Takes a single
         value or a list of values.
     """
-    try:
-        db = [20 * np.log10(x) for x in mag]
-        return db
-    except:
-        db = 20 * np.log10(mag)
-        return db
+    return 20 * np.log10(np.asarray(mag))
 
 
 def calc_RMS_based_on_sources(desired_SPL, num_sources):
@@ -232,7 +331,9 @@ def rms(sig):
         Written by: Travis M. Moore
         Last edited: Feb. 3, 2020
     """
-    theRMS = np.sqrt(np.mean(np.square(sig)))
+    # Fused square-and-sum (BLAS dot), no squared temporary
+    flat = np.ravel(sig)
+    theRMS = np.sqrt(np.dot(flat, flat) / flat.size)
 
     return theRMS
 
@@ -261,59 +362,26 @@ def setRMS(sig,amp,eq='n'):
         Last edited: May 17, 2022
     """
     if len(sig.shape) == 1:
-        rmsdb = mag2db(rms(sig))
-        refdb = amp
-        diffdb = np.abs(rmsdb - refdb)
-        if rmsdb > refdb:
-            sigAdj = sig / db2mag(diffdb)
-        elif rmsdb < refdb:
-            sigAdj = sig * db2mag(diffdb)
-        # Edit 5/17/22
-        # Added handling for when rmsdb == refdb
-        elif rmsdb == refdb:
-            sigAdj = sig
-        return sigAdj
+        # One scale factor covers the above/below/equal cases
+        scale = 10**((amp - mag2db(rms(sig)))/20)
+        return sig * scale
         
     elif len(sig.shape) == 2:
-        rmsdbLeft = mag2db(rms(sig[0]))
-        rmsdbRight = mag2db(rms(sig[1]))
-
-        ILD = np.abs(rmsdbLeft - rmsdbRight) # get lvl diff
-
-        # Determine lvl advantage
-        if rmsdbLeft > rmsdbRight:
-            lvlAdv = 'left'
-            #print("Adv: %s" % lvlAdv)
-        elif rmsdbRight > rmsdbLeft:
-            lvlAdv = 'right'
-            #print("Adv: %s" % lvlAdv)
-        elif rmsdbLeft == rmsdbRight:
-            lvlAdv = None
-
-        #refdb = amp - 3 # apply half amp to each channel
+        # Per-channel RMS in one fused pass
+        rmsdbLeft, rmsdbRight = mag2db(
+            np.sqrt(np.einsum('ij,ij->i', sig, sig) / sig.shape[1]))
+
+        # Scale each channel to the reference
         refdb = amp
-        diffdbLeft = np.abs(rmsdbLeft - refdb)
-        diffdbRight = np.abs(rmsdbRight - refdb)
-
-        # Adjust left channel
-        if rmsdbLeft > refdb:
-            sigAdjLeft = sig[0] / db2mag(diffdbLeft)
-        elif rmsdbLeft < refdb:
-            sigAdjLeft = sig[0] * db2mag(diffdbLeft)
-        # Adjust right channel
-        if rmsdbRight > refdb:
-            sigAdjRight = sig[1] / db2mag(diffdbRight)
-        elif rmsdbRight < refdb:
-            sigAdjRight = sig[1] * db2mag(diffdbRight)
-
-        # If there is a lvl difference to maintain across channels
+        scaleLeft = 10**((refdb - rmsdbLeft)/20)
+        scaleRight = 10**((refdb - rmsdbRight)/20)
+
+        # If there is a lvl difference to maintain across channels,
+        # give half of the (signed) ILD back to each channel
         if eq == 'n':
-            if lvlAdv == 'left':
-                sigAdjLeft = sigAdjLeft * db2mag(ILD/2)
-                sigAdjRight = sigAdjRight / db2mag(ILD/2)
-            elif lvlAdv == 'right':
-                sigAdjLeft = sigAdjLeft / db2mag(ILD/2)
-                sigAdjRight = sigAdjRight * db2mag(ILD/2)
-
-        sigBothAdj = np.array([sigAdjLeft, sigAdjRight])
+            ILD = rmsdbLeft - rmsdbRight # get lvl diff
+            scaleLeft *= 10**(ILD/40)
+            scaleRight *= 10**(-ILD/40)
+
+        sigBothAdj = sig * np.array([[scaleLeft], [scaleRight]])
         return sigBothAdj
@@ -5,9 +5,6 @@
 ###########
 # Data Science
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-rcParams.update({'figure.autolayout': True})
 
 # System
 import os
@@ -80,23 +77,25 @@ class Audio:
             print("audiomodel: Audio file not found!")
             raise FileNotFoundError
         else:
-            self.signal, self.fs = sf.read(self.audio)
+            self.signal, self.fs = sf.read(
+                self.audio, dtype='float32', always_2d=True)
             print(f"audiomodel: Sampling rate: {self.fs}")
 
 
     def _get_audio_details(self):
         """ Save/calculate WAV file details. """
         # Get number of channels
-        try:
+        # (WAV files are always 2-D; arrays may be 1-D)
+        if self.signal.ndim > 1:
             self.num_channels = self.signal.shape[1]
-        except IndexError:
+        else:
             self.num_channels = 1
         self.channels = np.array(range(1, self.num_channels+1))
         print(f"audiomodel: Number of channels in signal: {self.num_channels}")
 
         # Assign audio file attributes
         self.dur = len(self.signal) / self.fs
-        self.t = np.arange(0, self.dur, 1/self.fs)
+        self.t = general.time_base(self.dur, self.fs)
         print(f"audiomodel: Duration: {np.round(self.dur, 2)} seconds " +
             f"({np.round(self.dur/60, 2)} minutes)")
 
@@ -121,11 +120,6 @@ class Audio:
         self.routing = routing
         print("\naudiomodel: Preparing for playback...")
 
-        # Create a temporary audio file to modify
-        self.temp = self.signal.copy()
-        self.temp = self.temp.astype(np.float32)
-        print(f"audiomodel: Data type converted to {self.temp.dtype}")
-
         # Assign default sounddevice settings
         try:
             self._set_defaults()
@@ -139,8 +133,9 @@ class Audio:
             raise audio_exceptions.InvalidRouting(
                 self.num_channels, self.routing)
 
-        # Set level
+        # Set level (creates the float32 playback copy, self.temp)
         self._set_level()
+        print(f"audiomodel: Data type converted to {self.temp.dtype}")
 
         # Check for clipping after level has been applied
         try:
@@ -207,45 +202,42 @@ class Audio:
         if self.level == None:
             # Normalize if no level is provided
             print("audiomodel: No level provided; normalizing to +/-1")
-            if self.num_channels > 1:
-                for chan in range(0, self.num_channels):
-                    # Remove DC offset
-                    self.temp[:, chan] = self.temp[:, chan] \
-                        - np.mean(self.temp[:, chan])
-                    # Normalize
-                    self.temp[:, chan] = self.temp[:, chan] \
-                        / np.max(np.abs(self.temp[:, chan]))
-                    # account for num channels
-                    self.temp[:, chan] = self.temp[:, chan] \
-                        / self.num_channels 
-            elif self.num_channels == 1:
-                # Remove DC offset
-                self.temp = self.temp - np.mean(self.temp)
-                # Normalize
-                self.temp = self.temp / np.max(np.abs(self.temp))
-                # account for num channels
-                self.temp = self.temp / 1
+            # Normalization is done in place, so work on a copy
+            self.temp = self.signal.astype(np.float32, copy=True)
+            # Remove DC offset (axis 0 is per channel for 1-D and
+            # multichannel audio alike)
+            self.temp -= self.temp.mean(axis=0, keepdims=True)
+            peak = np.abs(self.temp).max(axis=0, keepdims=True)
+            # Normalize and account for num channels in one division
+            self.temp /= (peak * self.num_channels)
         else:
             # Convert level in dB to magnitude
             mag = general.db2mag(self.level)
             print(f"audiomodel: Adjusted Level (dB): {self.level}")
             print(f"audiomodel: Multiplying signal by: {np.round(mag,8)}")   
-            # Apply scaling factor to self.temp
-            self.temp = self.temp * mag
+            # Scale straight from the signal in a single float32 pass
+            self.temp = np.multiply(self.signal, mag, dtype=np.float32)
 
 
     def _check_clipping(self):
         """ Plot clipped waveform for visual inspection. """
-        if np.max(np.abs(self.temp)) > 1:
+        # Two reductions, no |temp| allocation (cheap at these buffer
+        #   sizes, and nothing to compile before the first trial)
+        if max(self.temp.max(), -self.temp.min()) > 1:
             # Raise exception to prevent playback
             raise audio_exceptions.Clipping
 
 
     def plot_waveform(self, title=None):
         """ Plot all channels overlaid. """
+        # Import plotting library on demand (slow to load)
+        import matplotlib.pyplot as plt
+        from matplotlib import rcParams
+        rcParams.update({'figure.autolayout': True})
+
         # Create time base
         dur = len(self.temp) / self.fs
-        t = np.arange(0, dur, 1/self.fs)
+        t = general.time_base(dur, self.fs)
         plt.plot(t, self.temp)
         plt.title(title)
         plt.xlabel("Time (s)")
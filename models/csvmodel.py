@@ -32,67 +32,89 @@ class CSVModel:
         else:
             self.data_directory = "Data"
 
+        # Current file name and path (set on first save)
+        self.filename = None
+        self.file = None
 
-    def _check_for_data_folder(self):
-        """ Check for existing data folder. Create a data folder if
-            it doesn't currently exist.
-        """
-        data_dir_exists = os.access(self.data_directory, os.F_OK)
-        if not data_dir_exists:
-            print(f"\ncsvmodel: {self.data_directory} directory not " +
-                "found! Creating it...")
-            os.mkdir(self.data_directory)
-            print(f"csvmodel: Successfully created {self.data_directory} " +
-                  "directory!")
+        # Open file handle and writer, reused across saves
+        self._fh = None
+        self._writer = None
 
 
     def _create_filename(self):
         """ Create file name and path. """
-        self.filename = f"{self.sessionpars['subject'].get()}_{self.sessionpars['condition'].get()}_{self.datestamp}.csv"
-        self.file = Path(os.path.join(self.data_directory, self.filename))
+        filename = f"{self.sessionpars['subject'].get()}_{self.sessionpars['condition'].get()}_{self.datestamp}.csv"
+        # Only build a new path when the name has changed
+        if filename != self.filename:
+            self.filename = filename
+            self.file = Path(self.data_directory) / filename
 
 
-    def _check_write_access(self):
-        """ Check for write access to store CSV. """
-        file_exists = os.access(self.file, os.F_OK)
-        parent_writable = os.access(self.file.parent, os.W_OK)
-        file_writable = os.access(self.file, os.W_OK)
-        if (
-            (not file_exists and not parent_writable) or
-            (file_exists and not file_writable)
-        ):
+    def _open(self, fieldnames):
+        """ Create the data folder, then open the current file 
+            for appending and build its writer. Raises 
+            PermissionError if the file cannot be opened.
+        """
+        self.close()
+
+        # Create data directory if it does not exist
+        os.makedirs(self.data_directory, exist_ok=True)
+
+        # Opening is the write-access check
+        try:
+            self._fh = open(self.file, 'a', newline='', buffering=1<<16)
+        except PermissionError:
             msg = f"\ncsvmodel: Permission denied accessing file: \
                 {self.filename}"
             raise PermissionError(msg)
+        self._writer = csv.DictWriter(self._fh, fieldnames=fieldnames,
+            extrasaction='ignore')
 
 
-    def _write_dict_to_csv(self, data):
-        """ Write dict data to CSV. Check for existing file to determine 
-            whether or not to include header when writing to CSV.
+    def _write_dicts_to_csv(self, rows):
+        """ Write a list of dicts to CSV in a single writerows call. 
+            Include the header when the file is new or empty.
         """
-        # Write file
-        newfile = not self.file.exists()
-        with open(self.file, 'a', newline='') as fh:
-            csvwriter = csv.DictWriter(fh, fieldnames=data.keys())
-            if newfile:
-                csvwriter.writeheader()
-            csvwriter.writerow(data)
-        print("\ncsvmodel: Record successfully saved!")
+        # Append mode starts at the end of the file
+        if self._fh.tell() == 0:
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        # Push the batch to disk so records survive a crash
+        self._fh.flush()
+        print(f"\ncsvmodel: {len(rows)} record(s) successfully saved!")
 
 
     def save_record(self, data):
         """ Save a dictionary of data to .csv file. """
-        # Create data directory if it does not exist
-        self._check_for_data_folder()
-        
-        # Create file name and full path
+        self.save_records([data])
+
+
+    def save_records(self, rows, fieldnames=None):
+        """ Save a list of dictionaries to .csv file in one write. 
+            FIELDNAMES fixes the column order (defaults to the keys 
+            of the first row); extra keys are ignored.
+        """
+        if fieldnames is None:
+            fieldnames = list(rows[0].keys())
+
+        # Create file name and full path (subject may have changed)
         self._create_filename()
 
-        # Check for write access
-        try:
-            self._check_write_access()
-        except PermissionError:
-            raise
+        # Reopen only when the file or columns have changed
+        if (
+            self._fh is None or
+            self._fh.name != str(self.file) or
+            list(self._writer.fieldnames) != list(fieldnames)
+        ):
+            self._open(fieldnames)
 
         # Append data to CSV
-        self._write_dict_to_csv(data)
+        self._write_dicts_to_csv(rows)
+
+
+    def close(self):
+        """ Close the open CSV file, if any. """
+        if self._fh is not None:
+            self._fh.close()
+        self._fh = None
+        self._writer = None
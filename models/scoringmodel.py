@@ -16,12 +16,16 @@ import os
 
 
 class ScoringModel:
-    def __init__(self):
-        """ Display system file browser and save data dir. """
-        try:
-            self.directory = filedialog.askdirectory()
-        except KeyError:
-            pass
+    def __init__(self, directory=None):
+        """ Load data from DIRECTORY. Display system file browser
+            to choose one if not provided.
+        """
+        if directory is None:
+            try:
+                directory = filedialog.askdirectory()
+            except KeyError:
+                pass
+        self.directory = directory
 
         self._organize_data()
 
@@ -29,20 +33,31 @@ class ScoringModel:
     def _organize_data(self):
         """ Concatenate data from all CSVs in dir. """
         # Get all .csv file names from provided directory
-        all_files = glob.glob(os.path.join(self.directory, "*.csv"))
-
-        # Create single dataframe
-        li = []
-        for file in all_files:
-            df = pd.read_csv(file)
-            li.append(df)
-        self.data = pd.concat(li)
-        self.data.reset_index(drop=True, inplace=True)
+        # (sorted: glob order is filesystem-dependent)
+        all_files = sorted(glob.glob(os.path.join(self.directory, "*.csv")))
+
+        # Create single dataframe (fixed dtypes skip inference) 
+        # from only the columns that score() uses
+        columns = [
+            'subject', 
+            'condition', 
+            'test_freq', 
+            'desired_level_dB', 
+            'reversal'
+        ]
+        dtypes = {'test_freq': 'int32', 'reversal': bool}
+        self.data = pd.concat(
+            (pd.read_csv(file, usecols=columns, dtype=dtypes) 
+                for file in all_files),
+            ignore_index=True
+        )
 
 
     def _avg_revs(self, df, num_reversals) -> float:
-        """ Custom function for use with Pandas apply().
-            Called from score().
+        """ Per-group reference implementation of the threshold 
+            calculation (for use with Pandas apply()). score() uses
+            an equivalent vectorized groupby; the tests compare 
+            against this.
             Find last n reversals and average to calculate thresholds.
 
             Returns: a single threshold value (rounded)
@@ -60,18 +75,20 @@ class ScoringModel:
         if num_reversals <= 0:
             raise ValueError("Number of reversals cannot be 0 or negative!")
 
-        # Get dataframe of thresholds derived from the last n reversals
-        thresholds = self.data.groupby(
-            by=[
-                'subject', 
-                'condition', 
-                'test_freq'
-            ]
-        ).apply(self._avg_revs, num_reversals=num_reversals)
+        keys = ['subject', 'condition', 'test_freq']
+
+        # Keep the last n reversals of each group, then average them
+        # (vectorized; same result as applying _avg_revs per group)
+        reversals = self.data[self.data['reversal'] == True]
+        last_n = reversals.groupby(keys).tail(num_reversals)
+        thresholds = last_n.groupby(keys)['desired_level_dB'].mean().round(2)
+
+        # Groups without reversals still get a (NaN) threshold
+        all_groups = self.data.groupby(keys).size().index
+        thresholds = thresholds.reindex(all_groups)
 
         # Organize dataframe
-        thresholds_df = thresholds.reset_index()
-        self.thresholds_df = thresholds_df.rename(columns={0:'threshold'})
+        self.thresholds_df = thresholds.rename('threshold').reset_index()
 
         self.write_to_csv(self.thresholds_df)
 
@@ -18,6 +18,8 @@ class SessionParsModel:
         'subject': {'type': 'str', 'value': '999'},
         'condition': {'type': 'str', 'value': 'TEST'},
         'disp_plots': {'type': 'int', 'value': 0},
+        'debug_mode': {'type': 'int', 'value': 0},
+        'save_wav': {'type': 'int', 'value': 0},
 
         # Stimulus option variables
         'num_stim_chans': {'type': 'int', 'value': 1},
@@ -11,9 +11,6 @@
 ###########
 # Data Science
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-rcParams.update({'figure.autolayout': True})
 
 
 ###################
@@ -242,6 +239,11 @@ class Staircase:
             Plot color-coded data and return average of
             last n reversals.
         """
+        # Import plotting library on demand (slow to load)
+        import matplotlib.pyplot as plt
+        from matplotlib import rcParams
+        rcParams.update({'figure.autolayout': True})
+
         # ALL DATA
         x_all = self._make_attribute_list(self.dw.datapoints, 'trial_number')
         y_all = self._make_attribute_list(self.dw.datapoints, 'level')
@@ -5,24 +5,55 @@
 ###########
 # Data Science
 import numpy as np
-#from matplotlib import pyplot as plt
+
+# GUI
+from tkinter import TclError
 
 # System
+import logging
+import os
 import random
+from pathlib import Path
+
+# Audio
+import soundfile as sf
 
 # Custom Modules
 from functions import general
 
 
+log = logging.getLogger('peat')
+
+
 #########
 # BEGIN #
 #########
 class StimulusModel:
-    def __init__(self, sessionpars):
+    # Fixed starting phases (radians), assigned to channels in order.
+    # Computed once; _get_random_phis returns a slice.
+    _PHIS = np.radians([140, 120, 40, 80, -80, 0, -140, -120, -40])
+    _PHIS.setflags(write=False)
+
+    def __init__(self, sessionpars, **kwargs):
 
         # Assign variables
         self.sessionpars = sessionpars
 
+        # Saved stimuli go in a Stimuli folder inside the data directory
+        if 'data_dir_name' in kwargs:
+            self.data_directory = kwargs['data_dir_name']
+        else:
+            self.data_directory = "Data"
+
+        # Cache the channel count; refreshed whenever it is written
+        self._num_chans = self.sessionpars['num_stim_chans'].get()
+        self.sessionpars['num_stim_chans'].trace_add(
+            'write', self._refresh_num_chans)
+
+        # Finished stimuli, keyed by every create_stimulus input
+        self._stim_cache = {}
+        self._STIM_CACHE_SIZE = 16
+
         # RETSPL levels for binaural listening in a sound field,
         # in a diffuse field. From ANSI S3.6 (Table 9a). 
         self.RETSPL = {
@@ -62,6 +93,19 @@ class StimulusModel:
             16000: 43.7
         }
 
+        # Sorted, aligned arrays of the table for vectorized lookup
+        self.RETSPL_F = np.array(sorted(self.RETSPL), dtype=np.float64)
+        self.RETSPL_L = np.array([self.RETSPL[f] for f in self.RETSPL_F])
+
+
+    def _refresh_num_chans(self, *_):
+        """ Update the cached number of stimulus channels. """
+        try:
+            self._num_chans = self.sessionpars['num_stim_chans'].get()
+        except TclError:
+            # Entry is mid-edit (e.g., empty); keep the last value
+            pass
+
 
     def get_test_freqs(self):
         """ Create list of integer test frequencies. """
@@ -73,6 +117,13 @@ class StimulusModel:
         return self.freqs, self.NUM_FREQS
 
 
+    def retspl(self, freqs):
+        """ Return RETSPLs for one or more frequencies, linearly 
+            interpolated between table entries.
+        """
+        return np.interp(freqs, self.RETSPL_F, self.RETSPL_L)
+
+
     def assign_stimulus_interval(self, intervals):
         """ Randomly assign stimulus to an interval. """
         stim_interval = random.sample(intervals, 1)
@@ -95,19 +146,40 @@ class StimulusModel:
         # number of channels and desired SPL
         multichan_lvl = general.calc_RMS_based_on_sources(
             desired_SPL=retspl_adj_level,
-            num_sources=self.sessionpars['num_stim_chans'].get()
+            num_sources=self._num_chans
         )
 
         return np.round(multichan_lvl, 2)
 
 
-    def _get_random_phis(self):
-        """ Generate n random phi values, in radians, based 
-            on the number of sources/channels.
+    def calc_presentation_lvl_batch(self, stair_lvls, freqs):
+        """ Vectorized calc_presentation_lvl for arrays of staircase 
+            levels and (tabled) frequencies.
+        """
+        freqs = np.asarray(freqs, dtype=np.float64)
+
+        # Look up exact RETSPL table entries
+        idx = np.searchsorted(self.RETSPL_F, freqs)
+        idx = np.minimum(idx, len(self.RETSPL_F) - 1)
+        missing = self.RETSPL_F[idx] != freqs
+        if np.any(missing):
+            raise KeyError(freqs[missing].tolist())
+        retspl_adj_level = np.asarray(stair_lvls) + self.RETSPL_L[idx]
+
+        # Calculate desired RMS level based on 
+        # number of channels and desired SPL
+        multichan_lvl = general.calc_RMS_based_on_sources(
+            desired_SPL=retspl_adj_level,
+            num_sources=self._num_chans
+        )
+
+        return np.round(multichan_lvl, 2)
+
+
+    def _get_random_phis(self, stim_chans):
+        """ Generate STIM_CHANS random phi values, in radians, 
+            one per source/channel.
         """
-        # Get number of sources/channels
-        stim_chans = self.sessionpars['num_stim_chans'].get()
-        
         # # List of possible starting phases that Daniel Smieja
         # # vetted for me.
         # degrees = [0, 40, 80, 120, 140, -40, -80, -120, -140]
@@ -117,10 +189,8 @@ class StimulusModel:
         # # Get list of random phases in degrees
         # random_degs = rng.sample(degrees, k=stim_chans)
 
-        degrees = [140, 120, 40, 80, -80, 0, -140, -120, -40]
-
-        # Return random phases in radians
-        return np.radians(degrees[:stim_chans])
+        # Return precomputed phases in radians
+        return self._PHIS[:stim_chans]
         #return np.radians(random_degs)
 
 
@@ -131,40 +201,81 @@ class StimulusModel:
             Returns: N-channel warble tone (FM)
         """
         # Get number of sources/channels
-        stim_chans = self.sessionpars['num_stim_chans'].get()
+        stim_chans = self._num_chans
+
+        # Reuse a cached stimulus, if available
+        key = (dur, fs, fc, mod_rate, mod_depth, stim_chans)
+        stim = self._stim_cache.get(key)
+        if stim is not None:
+            return stim
 
         # Get random phi values in radians based on number of sources
-        phi_rad = self._get_random_phis()
+        phi_rad = self._get_random_phis(stim_chans)
         
-        # Generate an n-channel warble tone array
-        sig_list = []
-        for ii in range(0, stim_chans):
-            # Generate warble tone based on current freq
-            wt = general.warble_tone(
-                dur=dur,
-                fs=fs, 
-                fc=fc,
-                phi=phi_rad[ii],
-                mod_rate=mod_rate,
-                mod_depth=mod_depth
-            )
-            # Apply gating
-            wt = general.doGate(wt, rampdur=0.04, fs=fs)
-
-            # Scale to -40 (default for this system)
-            wt = general.setRMS(wt, -40)
-
-            # # Plot first two cycles to illustrate random starting phase
-            # period = 1/fc
-            # samps = int(period * fs)
-            # samps = samps * 2
-            # plt.plot(wt[:samps])
-            # plt.show()
-            # plt.close()
-
-            # Add individual wt to list
-            sig_list.append(np.array(wt))
-
-        sig_list = np.array(sig_list).T
+        # Synthesize all channels at once: (chans, samples)
+        wts = general.warble_tone_batch(
+            dur=dur,
+            fs=fs,
+            fcs=np.full(stim_chans, fc),
+            phis=phi_rad,
+            mod_rate=mod_rate,
+            mod_depth=mod_depth
+        )
+
+        # Apply gating (envelope broadcasts across rows)
+        wts = general.doGate(wts, rampdur=0.04, fs=fs)
+
+        # Scale each channel to -40 (default for this system):
+        # per-channel RMS in one pass, then one broadcast multiply 
+        # written straight into the (samples, chans) output
+        rms = np.sqrt(np.einsum('ij,ij->i', wts, wts) / wts.shape[1])
+        sig_list = np.empty(wts.shape[::-1], dtype=np.float32)
+        np.multiply(wts.T, np.float32(general.db2mag(-40)) / rms, 
+            out=sig_list)
+
+        # Optionally save the stimulus to file
+        if self.sessionpars['save_wav'].get() == 1:
+            self._save_wav(sig_list, fs, fc)
+
+        # Cache a read-only copy; drop the oldest when full
+        sig_list.setflags(write=False)
+        if len(self._stim_cache) >= self._STIM_CACHE_SIZE:
+            self._stim_cache.pop(next(iter(self._stim_cache)))
+        self._stim_cache[key] = sig_list
 
         return sig_list
+
+
+    def create_stimulus_dict(self, dur, fs, freqs, mod_rate, mod_depth):
+        """ Synthesize the stimulus for every frequency in FREQS
+            up front.
+
+            Returns: dict of N-channel warble tones keyed by frequency
+        """
+        return {
+            fc: self.create_stimulus(dur, fs, fc, mod_rate, mod_depth)
+            for fc in freqs
+        }
+
+
+    def _save_wav(self, sig, fs, fc, block=4096):
+        """ Write a (samples, chans) stimulus to a 32-bit float 
+            WAV file in the Stimuli directory, BLOCK samples at 
+            a time. A failed write is logged, not raised: saving 
+            is optional and must not stop the session.
+        """
+        folder = Path(self.data_directory) / 'Stimuli'
+        path = folder / f"{fc}Hz_-40dB_{sig.shape[1]}ch.wav"
+
+        try:
+            os.makedirs(folder, exist_ok=True)
+            # Write contiguous row slabs (views) straight to the file; 
+            # FLOAT subtype matches the float32 samples
+            with sf.SoundFile(path, mode='w', samplerate=fs, 
+                    channels=sig.shape[1], subtype='FLOAT') as fh:
+                for start in range(0, sig.shape[0], block):
+                    fh.write(sig[start:start+block])
+        except (OSError, sf.LibsndfileError) as e:
+            log.warning("Could not save stimulus to %s: %s", path, e)
+            return
+        log.debug("Saved stimulus to %s", path)
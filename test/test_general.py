@@ -22,3 +22,22 @@ from functions import general
 def test_calc_RMS_based_on_sources(desired_SPL, num_sources, expected):
     result = general.calc_RMS_based_on_sources(desired_SPL, num_sources)
     assert np.isclose(result, expected)
+
+
+@pytest.mark.skipif(general._load_kernels() is None, reason="numba not installed")
+@pytest.mark.parametrize("fc", [250, 1000, 8000])
+def test_warble_tone_polynomial_sin_matches_reference(fc):
+    fast = general.warble_tone(1, 48000, fc, np.radians(-140), 5, 5)
+    ref = general.warble_tone(1, 48000, fc, np.radians(-140), 5, 5,
+        check_accuracy=True)
+    assert np.allclose(fast, ref, rtol=0, atol=1e-9)
+
+
+def test_warble_tone_batch_matches_single_tones():
+    fcs = [500, 1000, 8000]
+    phis = np.radians([140, 120, 40])
+    batch = general.warble_tone_batch(1, 48000, fcs, phis, 5, 5)
+    singles = [general.warble_tone(1, 48000, fc, phi, 5, 5) 
+        for fc, phi in zip(fcs, phis)]
+    assert batch.shape == (3, 48000)
+    assert np.allclose(batch, singles, rtol=0, atol=1e-9)
@@ -71,6 +71,14 @@ def test__organize_data_output_type(scoring_model):
     # Assert that data attribute is of type DataFrame
     assert isinstance(scoring_model.data, pd.DataFrame)
 
+def test_directory_argument_skips_dialog(temp_csv_dir, monkeypatch):
+    # A provided directory is loaded without opening the file browser
+    def fail():
+        raise AssertionError("askdirectory should not be called")
+    monkeypatch.setattr("models.scoringmodel.filedialog.askdirectory", fail)
+    model = ScoringModel(str(temp_csv_dir))
+    assert model.data.shape == (8, 5)
+
 def test__organize_data_output_shape(scoring_model):
     # Assert that data have expected shape and content
     assert scoring_model.data.shape == (8, 5)
@@ -134,3 +142,17 @@ def test_score_threshold_data_frame(scoring_model, monkeypatch):
     assert scoring_model.thresholds_df.shape == (2,4)
     assert list(scoring_model.thresholds_df.columns) ==\
           ['subject', 'condition', 'test_freq', 'threshold']
+
+def test_score_thresholds_match_avg_revs(scoring_model, monkeypatch):
+    # Vectorized score() must agree with the per-group reference
+    monkeypatch.setattr(ScoringModel, "write_to_csv", lambda self, d: None)
+    scoring_model.score(2)
+
+    keys = ['subject', 'condition', 'test_freq']
+    expected = {
+        key: scoring_model._avg_revs(group, 2)
+        for key, group in scoring_model.data.groupby(keys)
+    }
+    result = scoring_model.thresholds_df.set_index(keys)['threshold']
+    assert result.to_dict() == expected
+    assert list(result) == [42.5, 60]
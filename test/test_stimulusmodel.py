@@ -33,6 +33,7 @@ def create_sessionpars():
         'subject': tk.StringVar(value='P1234'),
         'condition': 'unit_testing',
         'disp_plots': 0,
+        'save_wav': tk.IntVar(value=0),
         # Stimulus option variables
         'num_stim_chans': tk.IntVar(value=1),
         'test_freqs': tk.StringVar(value="500, 1000, 2000, 4000"),
@@ -84,6 +85,33 @@ def test_RETSPL_at_1kHz(stim_model):
     assert stim_model.RETSPL[1000] == 0.8
 
 
+def test_retspl_matches_table(stim_model):
+    # Assert
+    freqs = [20, 31.5, 1000, 16000]
+    expected = [stim_model.RETSPL[f] for f in freqs]
+    assert list(stim_model.retspl(freqs)) == expected
+
+
+def test_retspl_interpolates_between_entries(stim_model):
+    # Assert
+    assert stim_model.retspl(900) == pytest.approx(0.9)
+
+
+def test_calc_presentation_lvl_batch_matches_scalar(stim_model):
+    # Assert
+    lvls, freqs = [30, 40, 50], [500, 1000, 4000]
+    expected = [stim_model.calc_presentation_lvl(l, f) 
+        for l, f in zip(lvls, freqs)]
+    assert list(stim_model.calc_presentation_lvl_batch(lvls, freqs)) \
+        == expected
+
+
+def test_calc_presentation_lvl_batch_unknown_freq(stim_model):
+    # Assert
+    with pytest.raises(KeyError):
+        stim_model.calc_presentation_lvl_batch([30], [999])
+
+
 def test_subject_from_sessionpars_exists(stim_model):
     # Assert
     assert stim_model.sessionpars['subject'].get() == "P1234"
@@ -127,19 +155,18 @@ def test_calc_presentation_lvl_valid_freq(monkeypatch, stim_model):
 
 
 def test__get_random_phis_one_chan(stim_model):
-    assert stim_model._get_random_phis() == pytest.approx([2.443461])
+    assert stim_model._get_random_phis(1) == pytest.approx([2.443461])
     
 
 def test__get_random_phis_three_chans(stim_model):
-    stim_model.sessionpars['num_stim_chans'].set(3)
-    assert stim_model._get_random_phis() == pytest.approx(
+    assert stim_model._get_random_phis(3) == pytest.approx(
         [2.443461, 2.094395, 0.6981317]
     )
 
 
 def test_create_stimulus_one_chan(monkeypatch, stim_model):
     # Mock function to replace _get_random_phis
-    def mock_phis():
+    def mock_phis(stim_chans):
         return [2.443461]
     # Apply monkeypatch
     monkeypatch.setattr(stim_model, "_get_random_phis", mock_phis)
@@ -151,7 +178,7 @@ def test_create_stimulus_three_chans(monkeypatch, stim_model):
     # Update number of stimulus channels to three
     stim_model.sessionpars['num_stim_chans'].set(3)
     # Mock function to replace _get_random_phis
-    def mock_phis():
+    def mock_phis(stim_chans):
         return [2.443461, 2.094395, 0.6981317]
     # Apply monkeypatch
     monkeypatch.setattr(stim_model, "_get_random_phis", mock_phis)
@@ -159,3 +186,33 @@ def test_create_stimulus_three_chans(monkeypatch, stim_model):
     sig = stim_model.create_stimulus(1,48000,1000,5,5)
     assert sig.shape[0] == 48000
     assert sig.shape[1] == 3
+
+
+def test_create_stimulus_dict_keys(stim_model):
+    # Act
+    stimuli = stim_model.create_stimulus_dict(1, 48000, [500, 1000], 5, 5)
+    # Assert
+    assert list(stimuli) == [500, 1000]
+    assert stimuli[1000].shape == (48000, 1)
+
+
+def test_save_wav_writes_under_data_directory(tmp_path, stim_model):
+    # Arrange
+    stim_model.data_directory = str(tmp_path)
+    sig = stim_model.create_stimulus(1, 48000, 1000, 5, 5)
+    # Act
+    stim_model._save_wav(sig, 48000, 1000)
+    # Assert
+    assert (tmp_path / 'Stimuli' / '1000Hz_-40dB_1ch.wav').exists()
+
+
+def test_save_wav_logs_oserror(tmp_path, caplog, stim_model):
+    # Arrange: a file where the data directory should be
+    blocker = tmp_path / 'Data'
+    blocker.write_text('')
+    stim_model.data_directory = str(blocker)
+    sig = stim_model.create_stimulus(1, 48000, 1000, 5, 5)
+    # Act
+    stim_model._save_wav(sig, 48000, 1000)
+    # Assert
+    assert 'Could not save stimulus' in caplog.text
@@ -12,6 +12,25 @@ from idlelib.tooltip import Hovertip
 import sounddevice as sd
 
 
+##########
+# Styles #
+##########
+# Named ttk styles are global: configure them once per app
+_STYLES_READY = False
+
+def _ensure_styles(master):
+    """ Configure custom styles the first time a dialog opens. """
+    global _STYLES_READY
+    if _STYLES_READY:
+        return
+    style = ttk.Style(master)
+    style.configure(
+        'Bold.TLabel', 
+        font=('TKDefaultFont', 10, 'bold')
+    )
+    _STYLES_READY = True
+
+
 #########
 # BEGIN #
 #########
@@ -46,11 +65,7 @@ class AudioDialog(tk.Toplevel):
         #################
         # Custom Styles #
         #################
-        self.style = ttk.Style()
-        self.style.configure(
-            'Bold.TLabel', 
-            font=('TKDefaultFont', 10, 'bold')
-        )
+        _ensure_styles(self)
 
 
         ##########
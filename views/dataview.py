@@ -7,11 +7,16 @@
 # GUI
 import tkinter as tk
 from tkinter import ttk
-from tkinter import messagebox
+from tkinter import filedialog
+
+# System
+import queue
+import threading
 
 # Custom Modules
 from models import scoringmodel
 from functions import general
+from widgets.progbar import ProgressBar
 
 
 #########
@@ -30,6 +35,13 @@ class ThresholdDialog(tk.Toplevel):
         self.title("Calculate Thresholds")
         self.grab_set()
 
+        # Results from worker threads (polled on the Tk thread)
+        self._q = queue.Queue()
+        self._bar = None
+
+        # Scoring model (created after a directory is chosen)
+        self.s = None
+
         # Populate frame with widgets
         self.draw_widgets()
 
@@ -74,9 +86,9 @@ class ThresholdDialog(tk.Toplevel):
         ttk.Label(lfrm_options, textvariable=self.thresh_data_dir_var, 
             borderwidth=2, relief="solid", width=30
             ).grid(row=20, column=10, sticky='w', padx=(0,10))
-        ttk.Button(lfrm_options, text="Browse", 
-                   command=self._create_scoring_class).grid(row=25, 
-                    column=10, sticky='w', pady=(0, 10))
+        self.btn_browse = ttk.Button(lfrm_options, text="Browse", 
+                   command=self._create_scoring_class)
+        self.btn_browse.grid(row=25, column=10, sticky='w', pady=(0, 10))
         
         # Number of reversals entry box
         self.num_reversals_var = tk.IntVar(value=0)
@@ -86,11 +98,16 @@ class ThresholdDialog(tk.Toplevel):
             textvariable=self.num_reversals_var
             ).grid(row=5, column=10, sticky='w')
 
+        # Inline validation message (no modal dialog)
+        self.err_var = tk.StringVar()
+        ttk.Label(frm_main, textvariable=self.err_var, foreground='red',
+            wraplength=300).grid(row=8, column=5, pady=(5, 0))
+
         # Submit button
-        ttk.Button(frm_submit,
+        self.btn_submit = ttk.Button(frm_submit,
             text="Submit",
-            command=self._on_submit).grid(
-                row=5, column=5, pady=(10,0))
+            command=self._on_submit)
+        self.btn_submit.grid(row=5, column=5, pady=(10,0))
 
 
     #############
@@ -110,42 +127,117 @@ class ThresholdDialog(tk.Toplevel):
         # Set the window position
         self.geometry("+%d+%d" % (x, y))
 
-        # Display window
-        self.deiconify()
+        # Display window (mapped in the same idle pass as the geometry)
+        self.after_idle(self.deiconify)
 
 
     def _create_scoring_class(self):
-        """ Instantiate Scoring Model. """
-        # Instantiate ScoringModel object
-        self.s = scoringmodel.ScoringModel()
-
-        # Retrieve and truncate threshold data directory path
-        short_thresh_data_path = general.truncate_path(
-            self.s.directory,
-            length=30
-        )
-        self.thresh_data_dir_var.set(value=short_thresh_data_path)
+        """ Choose a data directory, then load it in a worker thread. """
+        # The file browser must run on the Tk thread
+        directory = filedialog.askdirectory()
+        if not directory:
+            return
+
+        # Load CSVs without blocking the event loop
+        self._start_worker(self._load_scoring, directory)
+
+
+    def _load_scoring(self, directory):
+        """ Worker: instantiate Scoring Model. Never touches Tk. """
+        try:
+            model = scoringmodel.ScoringModel(directory)
+        except (OSError, ValueError) as e:
+            self._q.put(('error', f"Invalid data directory: {e}"))
+            return
+        self._q.put(('loaded', model))
 
 
     def _on_submit(self):
         """ Calculate thresholds using scoringmodel. """
-        try:
-            self.s.score(self.num_reversals_var.get())
-        except AttributeError:
-            msg = "You must provide a valid data directory!"
-            messagebox.showerror(
-                title="Missing Directory",
-                message=msg,
-            )
+        if self.s is None:
+            self.err_var.set("You must provide a valid data directory!")
             return
+
+        # Clear any previous error
+        self.err_var.set("")
+
+        # Read Tk variable here: the worker must not
+        self._start_worker(self._score, self.num_reversals_var.get())
+
+
+    def _score(self, num_reversals):
+        """ Worker: calculate and write thresholds. Never touches Tk. """
+        try:
+            self.s.score(num_reversals)
         except ValueError as e:
-            messagebox.showerror(
-                title="Invalid Quantity",
-                message=e
-            )
+            self._q.put(('error', str(e)))
+            return
+        self._q.put(('scored', None))
+
+
+    def _start_worker(self, target, *args):
+        """ Show the progress bar and run TARGET in a daemon thread.
+            Only one worker runs at a time.
+        """
+        if self._bar is not None:
+            return
+
+        # Block new requests until this worker reports back
+        self._set_buttons_state('disabled')
+
+        # The bar animates until the worker sets the stop event
+        stop_event = threading.Event()
+        self._bar = ProgressBar(self, stop_event=stop_event)
+
+        def run():
+            try:
+                target(*args)
+            except Exception as e:
+                # Always post a result, or _poll_q would wait forever
+                self._q.put(('error', str(e)))
+            finally:
+                stop_event.set()
+
+        threading.Thread(target=run, daemon=True).start()
+        self.after(50, self._poll_q)
+
+
+    def _set_buttons_state(self, state):
+        """ Enable ('!disabled') or disable the Browse/Submit buttons. """
+        for btn in (self.btn_browse, self.btn_submit):
+            btn.state([state])
+
+
+    def _poll_q(self):
+        """ Handle worker results on the Tk thread. """
+        try:
+            kind, payload = self._q.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_q)
             return
 
-        self.destroy()
+        # Close progress bar and accept new requests
+        if self._bar is not None:
+            self._bar.destroy()
+            self._bar = None
+        self._set_buttons_state('!disabled')
+
+        if kind == 'loaded':
+            self.s = payload
+            # Retrieve and truncate threshold data directory path
+            short_thresh_data_path = general.truncate_path(
+                self.s.directory,
+                length=30
+            )
+            self.thresh_data_dir_var.set(value=short_thresh_data_path)
+            self.err_var.set("")
+        elif kind == 'scored':
+            # Hide now; tear down widgets once the event loop is idle
+            self.grab_release()
+            self.withdraw()
+            self.after_idle(self.destroy)
+        elif kind == 'error':
+            self.err_var.set(payload)
 
 
 if __name__ == '__main__':
@@ -7,8 +7,103 @@
 # GUI packages
 import tkinter as tk
 from tkinter import ttk
-from tkinter import messagebox
-from idlelib.tooltip import Hovertip
+from tkinter import font as tkfont
+
+# System
+import logging
+import re
+
+# Custom
+from widgets.tooltip import TooltipManager
+
+
+# Console output (shares the controller's logger)
+log = logging.getLogger('peat')
+
+# Whitespace-separated tokens (counted without building a list)
+_WS_RE = re.compile(r'\S+')
+
+# Partial numbers accepted while typing (e.g., '' and '-')
+_INT_RE = re.compile(r'-?\d*')
+_FLOAT_RE = re.compile(r'-?\d*\.?\d*')
+
+
+def _is_int(text):
+    """ Entry validatecommand: allow only (partial) integers. """
+    return _INT_RE.fullmatch(text) is not None
+
+
+def _is_float(text):
+    """ Entry validatecommand: allow only (partial) floats. """
+    return _FLOAT_RE.fullmatch(text) is not None
+
+
+########
+# Spec #
+########
+# Frame title -> fields, drawn top to bottom. Field layouts by kind:
+#   ('entry', label, sessionpars key, width, tooltip, keystroke check)
+#   ('check', text, sessionpars key, tooltip)
+#   ('combo', label, sessionpars key, values, tooltip)
+SPEC = {
+    'Session Information': (
+        ('entry', "Subject:", 'subject', 20,
+            "A unique subject identifier.\nCan be alpha, numeric, or both.",
+            None),
+        ('entry', "Condition:", 'condition', 20,
+            "A unique condition name.\nCan be alpha, numeric, or both."
+            "\nSeparate words with underscores.",
+            None),
+        ('check', "Display Plots", 'disp_plots',
+            "Display staircase plots after each threshold."),
+        ('check', "Save Stimuli", 'save_wav',
+            "Write each new stimulus to a WAV file\nin the Stimuli folder."),
+    ),
+    'Stimulus Options': (
+        ('entry', "# of Channels:", 'num_stim_chans', 20,
+            "A SINGLE number stating how many channels are desired"
+            "\nUpdate channel routing accordingly.",
+            'int'),
+        ('entry', "Duration (s):", 'duration', 20,
+            "Duration of the stimulus (per interval) in seconds.",
+            'float'),
+        ('entry', "Frequencies (Hz):", 'test_freqs', 50,
+            "Frequencies to test in a given session.\nSeparate multiple "
+            "frequencies with a comma and space.\nFrequencies will be "
+            "tested in the order provided.",
+            None),
+    ),
+    'Staircase Options': (
+        ('entry', "Starting Level (dB):", 'starting_level', 20,
+            "The starting level for each new threshold search.",
+            'float'),
+        ('entry', "Minimum Level (dB):", 'min_level', 20,
+            "The minimum permissible output level.",
+            'float'),
+        ('entry', "Maximum Level (dB):", 'max_level', 20,
+            "The maximum permissible output level.",
+            'float'),
+        ('entry', "Step Size(s):", 'step_sizes', 20,
+            "The step size(s) used by the staircase to bracket a threshold."
+            "\nThe last step size will be repeated until all reversals "
+            "have been collected.\nSeparate multiple values with a comma "
+            "and space.",
+            None),
+        ('entry', "Reversals:", 'num_reversals', 20,
+            "The number of reversals to obtain before stopping the "
+            "procedure.",
+            'int'),
+        ('entry', "Max Trials:", 'max_trials', 20,
+            "The maximum number of trials.\nThe app will stop if exceeded.",
+            'int'),
+        ('combo', "Rapid Descend:", 'rapid_descend', ("Yes", "No"),
+            "Initial decrease with 1-down rule to reach threshold faster."),
+    ),
+}
+
+# Shared grid settings
+_FRAME_OPTIONS = {'padx': 10, 'pady': 10}
+_WIDGET_OPTIONS = {'padx': 5, 'pady': 5}
 
 
 #########
@@ -27,240 +122,152 @@ class SessionDialog(tk.Toplevel):
         self.withdraw()
         self.resizable(False, False)
         self.title("Settings")
-        self.grab_set()
-
-
-        #################
-        # Create Frames #
-        #################
-        # Shared frame settings
-        frame_options = {'padx': 10, 'pady': 10}
-        widget_options = {'padx': 5, 'pady': 5}
-
-        # Session info frame
-        frm_session = ttk.Labelframe(self, text='Session Information')
-        frm_session.grid(row=5, column=5, **frame_options, sticky='nsew')
+        self.protocol("WM_DELETE_WINDOW", self._hide)
 
-        # Stimulus options frame
-        frm_stimulus = ttk.Labelframe(self, text='Stimulus Options')
-        frm_stimulus.grid(row=10, column=5, **frame_options, sticky='nsew')
+        # Widgets are drawn on first show and reused afterwards
+        self._built = False
+        self._size = None
 
-        # Staircase options frame
-        frm_staircase = ttk.Labelframe(self, text='Staircase Options')
-        frm_staircase.grid(row=15, column=5, **frame_options, sticky='nsew')
+        # Display dialog
+        self.show()
 
-        # # Audio file browser frame
-        # frm_audiopath = ttk.Labelframe(self, text="Audio File Directory")
-        # frm_audiopath.grid(row=15, column=5, **frame_options, ipadx=5, 
-        #     ipady=5)
-
-        # # Matrix file browser frame
-        # frm_matrixpath = ttk.Labelframe(self, text='Matrix File Path')
-        # frm_matrixpath.grid(row=20, column=5, **frame_options, ipadx=5, 
-        #     ipady=5)
 
+    def _build_once(self):
+        """ Draw the dialog widgets. Only runs on the first show. """
+        if self._built:
+            return
+        self._built = True
 
         ################
         # Draw Widgets #
         ################
-        # Default amount of time for tool tips to appear
-        tt_delay = 1000 # ms
-
-        # SESSION #
-        # Subject
-        lbl_sub = ttk.Label(frm_session, text="Subject:")
-        lbl_sub.grid(row=5, column=5, sticky='e', **widget_options)
-        sub_tt = Hovertip(
-            anchor_widget=lbl_sub, 
-            text="A unique subject identifier.\nCan be alpha, numeric, or both.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_session, width=20, 
-            textvariable=self.sessionpars['subject']
-            ).grid(row=5, column=10, sticky='w')
-
-        # Condition
-        lbl_cond = ttk.Label(frm_session, text="Condition:")
-        lbl_cond.grid(row=10, column=5, sticky='e', **widget_options)
-        cond_tt = Hovertip(
-            anchor_widget=lbl_cond, 
-            text="A unique condition name.\nCan be alpha, numeric, or both.\nSeparate words with underscores.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_session, width=20, 
-            textvariable=self.sessionpars['condition']
-            ).grid(row=10, column=10, sticky='w')
-
-        # Plots
-        chk_plots = ttk.Checkbutton(frm_session, text="Display Plots",
-            takefocus=0, variable=self.sessionpars['disp_plots'])
-        chk_plots.grid(row=15, column=5,  columnspan=20, sticky='w', 
-            **widget_options)
-        plots_tt = Hovertip(
-            anchor_widget=chk_plots,
-            text="Display staircase plots after each threshold.",
-            hover_delay=tt_delay
-        )
-
-
-        # STIMULUS #
-        # Number of channels for stimulus
-        lbl_num_chans = ttk.Label(frm_stimulus, text="# of Channels:")
-        lbl_num_chans.grid(row=5, column=5, sticky='e', **widget_options)
-        num_chans_tt = Hovertip(
-            anchor_widget=lbl_num_chans,
-            text="A SINGLE number stating how many channels are desired" + 
-                "\nUpdate channel routing accordingly.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_stimulus, width=20, 
-            textvariable=self.sessionpars['num_stim_chans']
-            ).grid(row=5, column=10, sticky='w')
-
-        # Duration
-        lbl_dur = ttk.Label(frm_stimulus, text="Duration (s):")
-        lbl_dur.grid(row=10, column=5, sticky='e', **widget_options)
-        dur_tt = Hovertip(
-            anchor_widget=lbl_dur,
-            text="Duration of the stimulus (per interval) in seconds.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_stimulus, width=20, 
-            textvariable=self.sessionpars['duration']
-            ).grid(row=10, column=10, sticky='w')
-
-        # Test Frequencies
-        lbl_freqs = ttk.Label(frm_stimulus, text="Frequencies (Hz):")
-        lbl_freqs.grid(row=15, column=5, sticky='e', **widget_options)
-        freqs_tt = Hovertip(
-            anchor_widget=lbl_freqs,
-            text="Frequencies to test in a given session.\nSeparate multiple frequencies with a comma and space.\nFrequencies will be tested in the order provided.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_stimulus, width=50, 
-            textvariable=self.sessionpars['test_freqs']
-            ).grid(row=15, column=10, sticky='w', padx=(0,10))
-
-
-        # STAIRCASE #
-        # Starting Level
-        lbl_level = ttk.Label(frm_staircase, text="Starting Level (dB):")
-        lbl_level.grid(row=5, column=5, sticky='e', **widget_options)
-        level_tt = Hovertip(
-            anchor_widget=lbl_level,
-            text="The starting level for each new threshold search.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_staircase, width=20, 
-            textvariable=self.sessionpars['starting_level']
-            ).grid(row=5, column=10, sticky='w')
-
-        # Minimum Level
-        lbl_min_lvl = ttk.Label(frm_staircase, text="Minimum Level (dB):")
-        lbl_min_lvl.grid(row=10, column=5, sticky='e', **widget_options)
-        min_lvl_tt = Hovertip(
-            anchor_widget=lbl_min_lvl,
-            text="The minimum permissible output level.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_staircase, width=20, 
-            textvariable=self.sessionpars['min_level']
-            ).grid(row=10, column=10, sticky='w')
-        
-        # Maximum Level
-        lbl_max_lvl = ttk.Label(frm_staircase, text="Maximum Level (dB):")
-        lbl_max_lvl.grid(row=15, column=5, sticky='e', **widget_options)
-        max_lvl_tt = Hovertip(
-            anchor_widget=lbl_max_lvl,
-            text="The maximum permissible output level.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_staircase, width=20, 
-            textvariable=self.sessionpars['max_level']
-            ).grid(row=15, column=10, sticky='w')
-        
-        # Step Sizes
-        lbl_steps = ttk.Label(frm_staircase, text="Step Size(s):")
-        lbl_steps.grid(row=20, column=5, sticky='e', **widget_options)
-        steps_tt = Hovertip(
-            anchor_widget=lbl_steps,
-            text="The step size(s) used by the staircase to bracket a " + \
-                "threshold.\nThe last step size will be repeated until " + \
-                "all reversals have been collected.\nSeparate multiple " + \
-                "values with a comma and space.",
-                hover_delay=tt_delay
-        )
-        ttk.Entry(frm_staircase, width=20, 
-            textvariable=self.sessionpars['step_sizes']
-            ).grid(row=20, column=10, sticky='w')
-
-        # Number of Reversals
-        lbl_num_revs = ttk.Label(frm_staircase, text="Reversals:")
-        lbl_num_revs.grid(row=25, column=5, sticky='e', **widget_options)
-        num_revs_tt = Hovertip(
-            anchor_widget=lbl_num_revs,
-            text="The number of reversals to obtain before stopping the procedure.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_staircase, width=20, 
-            textvariable=self.sessionpars['num_reversals']
-            ).grid(row=25, column=10, sticky='w')
-        
-        # Maximum number of trials
-        lbl_max_trials = ttk.Label(frm_staircase, text="Max Trials:")
-        lbl_max_trials.grid(row=25, column=5, sticky='e', **widget_options)
-        Hovertip(
-            anchor_widget=lbl_max_trials,
-            text="The maximum number of trials.\nThe app will stop if exceeded.",
-            hover_delay=tt_delay
-        )
-        ttk.Entry(frm_staircase, width=20, 
-            textvariable=self.sessionpars['max_trials']
-            ).grid(row=25, column=10, sticky='w')
-
-        # Rapid Descend
-        lbl_descend = ttk.Label(frm_staircase, text="Rapid Descend:")
-        lbl_descend.grid(row=30, column=5, sticky='e', **widget_options)
-        descend_tt = Hovertip(
-            anchor_widget=lbl_descend,
-            text="Initial decrease with 1-down rule to reach threshold faster.",
-            hover_delay=tt_delay
-        )
-        vlist = ["Yes", "No"]
-        ttk.Combobox(
-            frm_staircase, 
-            textvariable=self.sessionpars['rapid_descend'], 
-            values=vlist,
-            state='readonly'
-        ).grid(row=30, column=10, sticky='w')
+        # Shared tooltip window (1000 ms delay)
+        self.tips = TooltipManager(self, delay=1000)
+
+        # Keystroke validators (registered once with Tcl)
+        self._vcmds = {
+            'int': self.register(_is_int),
+            'float': self.register(_is_float)
+        }
+
+        # Draw frames and fields
+        self._build_from_spec(SPEC)
+
+        # Inline validation message (no modal dialog)
+        self.err_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.err_var, foreground='red',
+            wraplength=400).grid(row=38, column=5, padx=10)
+        # Reserve two lines: the window size is pinned after first show
+        linespace = tkfont.nametofont('TkDefaultFont').metrics('linespace')
+        self.rowconfigure(38, minsize=2*linespace)
 
         # Submit button
         btn_submit = ttk.Button(self, text="Submit", command=self._on_submit)
         btn_submit.grid(row=40, column=5, columnspan=2, pady=(0, 10))
 
-        # Center the session dialog window
-        self.center_window()
+
+    def _build_from_spec(self, spec):
+        """ Create a Labelframe per SPEC entry and fill it with fields. 
+            Entries are created in batched Tcl scripts.
+        """
+        makers = {
+            'entry': self._make_entry,
+            'check': self._make_check,
+            'combo': self._make_combo
+        }
+        script = []
+        for frame_row, (title, fields) in enumerate(spec.items(), start=1):
+            frm = ttk.Labelframe(self, text=title)
+            frm.grid(row=frame_row*5, column=5, sticky='nsew',
+                **_FRAME_OPTIONS)
+            for row, (kind, *args) in enumerate(fields, start=1):
+                # Run queued entries first to keep creation (tab) order
+                if kind != 'entry' and script:
+                    self.tk.eval('\n'.join(script))
+                    script.clear()
+                cmds = makers[kind](frm, row*5, *args)
+                if cmds:
+                    script.append(cmds)
+        if script:
+            self.tk.eval('\n'.join(script))
+
+
+    def _make_entry(self, frm, row, text, var, width, tip, check):
+        """ Labelled entry, optionally validated per keystroke.
+            Draws the label and returns the Tcl commands for the entry.
+        """
+        lbl = ttk.Label(frm, text=text)
+        lbl.grid(row=row, column=5, sticky='e', **_WIDGET_OPTIONS)
+        self.tips.register(lbl, tip)
+
+        # Path, variable and command names are plain Tcl words
+        path = '%s.e_%s' % (frm, var)
+        cmds = 'ttk::entry %s -width %d -textvariable %s' % (
+            path, width, self.sessionpars[var])
+        if check is not None:
+            cmds += ' -validate key -validatecommand {%s %%P}' % (
+                self._vcmds[check])
+        cmds += '\ngrid %s -row %d -column 10 -sticky w -padx {0 10}' % (
+            path, row)
+        return cmds
+
+
+    def _make_check(self, frm, row, text, var, tip):
+        """ Checkbutton spanning the frame. """
+        chk = ttk.Checkbutton(frm, text=text, takefocus=0, 
+            variable=self.sessionpars[var])
+        chk.grid(row=row, column=5, columnspan=20, sticky='w', 
+            **_WIDGET_OPTIONS)
+        self.tips.register(chk, tip)
+
+
+    def _make_combo(self, frm, row, text, var, values, tip):
+        """ Labelled read-only combobox. """
+        lbl = ttk.Label(frm, text=text)
+        lbl.grid(row=row, column=5, sticky='e', **_WIDGET_OPTIONS)
+        ttk.Combobox(frm, textvariable=self.sessionpars[var], 
+            values=values, state='readonly'
+            ).grid(row=row, column=10, sticky='w')
+        self.tips.register(lbl, tip)
 
 
     #############
     # Functions #
     #############
+    def show(self):
+        """ Draw widgets if needed, then display the dialog. """
+        self._build_once()
+        self.grab_set()
+
+        # Center the session dialog window
+        self.center_window()
+
+
+    def _hide(self):
+        """ Hide the dialog so it can be reused. """
+        self.tips.hide()
+        self.grab_release()
+        self.withdraw()
+
+
     def center_window(self):
         """ Center the TopLevel window over the root window. """
-        # Get updated window size (after drawing widgets)
-        self.update_idletasks()
+        # Get updated window size (after drawing widgets). The widgets
+        #   never change size, so only the first show needs a layout pass
+        if self._size is None:
+            self.update_idletasks()
+            self._size = (self.winfo_reqwidth(), self.winfo_reqheight())
+        w, h = self._size
 
         # Calculate the x and y coordinates to center the window
-        x = self.parent.winfo_x() \
-            + (self.parent.winfo_width() - self.winfo_reqwidth()) // 2
-        y = self.parent.winfo_y() \
-            + (self.parent.winfo_height() - self.winfo_reqheight()) // 2
+        x = self.parent.winfo_x() + (self.parent.winfo_width() - w) // 2
+        y = self.parent.winfo_y() + (self.parent.winfo_height() - h) // 2
 
-        # Set the window position
-        self.geometry("+%d+%d" % (x, y))
+        # Pin the window size and position in one call
+        self.geometry("%dx%d+%d+%d" % (w, h, x, y))
 
-        # Display window
-        self.deiconify()
+        # Display window (mapped in the same idle pass as the geometry)
+        self.after_idle(self.deiconify)
 
 
     def _check_channels(self):
@@ -282,14 +289,8 @@ class SessionDialog(tk.Toplevel):
                 return False
             return True
         except tk.TclError:
-            messagebox.showwarning(
-                title="Invalid Entry!",
-                message="Please enter a single integer for the total number " +
-                    "of channels for audio playback.",
-                detail="Do not enter every channel here: do that in the " +
-                    "audio device settings."
-            )
-            raise
+            # Empty or partial entry
+            return False
 
 
     def _check_test_freqs(self):
@@ -326,79 +327,132 @@ class SessionDialog(tk.Toplevel):
         return True
 
 
+    def _get_number(self, key, message):
+        """ Return the value of numeric session parameter KEY.
+            Partial entries (e.g., '' or '-') pass the keystroke
+            validators but cannot be read: show MESSAGE and return
+            None instead.
+        """
+        try:
+            return self.sessionpars[key].get()
+        except tk.TclError:
+            self.err_var.set(message)
+            return None
+
+
     def _check_reversals(self):
         """ Ensure there are enough reversals for step sizes. """
-        revs = self.sessionpars['num_reversals'].get() 
-        steps = int(len(self.sessionpars['step_sizes'].get().split()))
+        sp = self.sessionpars
+        revs = self._get_number('num_reversals', 
+            "Enter a whole number of reversals!")
+        if revs is None:
+            return False
+        steps = sum(1 for _ in _WS_RE.finditer(sp['step_sizes'].get()))
 
-        return revs >= steps
+        if revs < steps:
+            self.err_var.set("The number of reversals must at least "
+                "equal the number of steps!")
+            return False
+        return True
 
 
     def _check_levels(self):
-        """ Ensure minimum level is less than maximum level. """
-        min_level = self.sessionpars['min_level'].get()
-        max_level = self.sessionpars['max_level'].get()
+        """ Ensure levels are numbers and minimum level is less than 
+            maximum level. 
+        """
+        levels = [
+            self._get_number(key, f"Enter a number for the {name} level!")
+            for key, name in (('starting_level', 'starting'),
+                ('min_level', 'minimum'), ('max_level', 'maximum'))
+        ]
+        if None in levels:
+            return False
+        _, min_level, max_level = levels
 
-        return max_level > min_level
+        if max_level <= min_level:
+            self.err_var.set("The maximum level must exceed the minimum "
+                "level!")
+            return False
+        return True
+
+
+    def _check_duration(self):
+        """ Ensure the stimulus duration is a positive number. """
+        dur = self._get_number('duration', 
+            "Enter a number for the duration!")
+        if dur is None:
+            return False
+        if dur <= 0:
+            self.err_var.set("The duration must be greater than zero!")
+            return False
+        return True
+
+
+    def _check_max_trials(self):
+        """ Ensure the maximum number of trials is a positive integer. """
+        trials = self._get_number('max_trials',
+            "Enter a whole number of trials!")
+        if trials is None:
+            return False
+        if trials <= 0:
+            self.err_var.set("The maximum number of trials must be "
+                "greater than zero!")
+            return False
+        return True
 
 
     def _on_submit(self):
         """ Perform various validation checks.
             Send submit event to controller.
         """
-        # Convert rapid descend response to boolean
-        if self.sessionpars['rapid_descend'].get() == "Yes":
+        # Convert rapid descend response to boolean (one Tcl read)
+        rapid_descend = self.sessionpars['rapid_descend'].get()
+        if rapid_descend == "Yes":
             self.sessionpars['rapid_descend_bool'].set(True)
-        elif self.sessionpars['rapid_descend'].get() == "No":
+        elif rapid_descend == "No":
             self.sessionpars['rapid_descend_bool'].set(False)
 
         # Make sure the number of channels is supported by
         #   the number of non-overlapping phis.
         if not self._check_channels():
-            messagebox.showerror(
-                title="Invalid Channels",
-                message="Invalid number of channels!",
-                detail="The maximum number of channels is nine."\
-                    "\nEnter a single integer."
-            )
+            self.err_var.set("Invalid number of channels! Enter a single "
+                "integer (maximum of nine).")
             return
 
         # Check that frequencies are allowable (have RETSPLs)
         if not self._check_test_freqs():
-            messagebox.showerror(
-                title="Invalid Frequency",
-                message="Invalid test frequency found!",
-                detail="See Help>README for a list of valid test frequencies."
-            )
+            self.err_var.set("Invalid test frequency found! See Help>README "
+                "for a list of valid test frequencies.")
             return  
         
+        # Make sure the duration is a positive number
+        #   (these checks set their own error messages)
+        if not self._check_duration():
+            return
+
         # Make sure the number of reversals at least matches
         #   the number of steps
         if not self._check_reversals():
-            messagebox.showerror(
-                title="Not Enough Reversals",
-                message="The number of reversals must at least equal the " + 
-                    "number of steps!"
-            )
             return
         
-        # Make sure max_level > min_level
+        # Make sure levels are numbers and max_level > min_level
         if not self._check_levels():
-            messagebox.showerror(
-                title="Invalid Levels",
-                message="The maximum level must exceed the minimum level!"
-            )
+            return
+
+        # Make sure the maximum number of trials is a positive integer
+        if not self._check_max_trials():
             return
 
         # Make sure step sizes are integers
         if not self._check_step_sizes():
-            messagebox.showerror(
-                title="Invalid Step Size",
-                message="Step sizes must be integers!"
-            )
+            self.err_var.set("Step sizes must be integers!")
             return
 
+        # Clear any previous error
+        self.err_var.set("")
+
         # Send save event to controller
-        print("\nviews_sessiondialog: Sending save event...")
-        self.parent.event_generate('<<SessionSubmit>>')
-        self.destroy()
+        # (queued with 'tail' so the controller runs after the dialog hides)
+        log.debug("Sending session save event...")
+        self.parent.event_generate('<<SessionSubmit>>', when='tail')
+        self._hide()
@@ -0,0 +1,67 @@
+""" Progress bar window.
+
+    Shown while long-running work happens off the Tk event thread.
+"""
+
+###########
+# Imports #
+###########
+# GUI packages
+import tkinter as tk
+from tkinter import ttk
+
+
+#########
+# BEGIN #
+#########
+class ProgressBar(tk.Toplevel):
+    """ Small window with an animated progress bar. """
+    def __init__(self, parent, pb_length=200, stop_event=None,
+                 title="Please wait...", *args, **kwargs):
+        super().__init__(parent, *args, **kwargs)
+
+        # Assign variables
+        self.parent = parent
+        self._stop = stop_event
+        self._after_id = None
+
+        # Window settings
+        self.withdraw()
+        self.resizable(False, False)
+        self.title(title)
+        self.transient(parent)
+
+        # Progress bar (determinate, stepped by _tick at 10 Hz rather
+        #   than Tk's faster internal indeterminate animation)
+        self.progbar = ttk.Progressbar(self, orient='horizontal',
+            mode='determinate', maximum=100, length=pb_length)
+        self.progbar.grid(row=5, column=5, padx=10, pady=10)
+
+        # Center over parent and display
+        self.update_idletasks()
+        x = self.parent.winfo_rootx() \
+            + (self.parent.winfo_width() - self.winfo_reqwidth()) // 2
+        y = self.parent.winfo_rooty() \
+            + (self.parent.winfo_height() - self.winfo_reqheight()) // 2
+        self.geometry("+%d+%d" % (x, y))
+        self.deiconify()
+
+        # Start animation
+        self._after_id = self.after(0, self._tick)
+
+
+    def _tick(self):
+        """ Advance the bar until the stop event is set. """
+        self.progbar['value'] = (self.progbar['value'] + 5) % 100
+        if self._stop is None or not self._stop.is_set():
+            self._after_id = self.after(100, self._tick)
+        else:
+            self._after_id = None
+
+
+    def destroy(self):
+        """ Cancel the pending tick before destroying the window. """
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
@@ -0,0 +1,88 @@
+""" Shared tooltip manager.
+
+    One hidden tooltip window serves every registered widget in a
+    Toplevel. Enter/Leave are bound once on the Toplevel (which is
+    in each child's bindtags), and the tooltip text is looked up
+    by widget path.
+"""
+
+###########
+# Imports #
+###########
+# GUI packages
+import tkinter as tk
+
+
+#########
+# BEGIN #
+#########
+class TooltipManager:
+    """ Display tooltips for registered widgets using a single
+        reused window and timer.
+    """
+    def __init__(self, master, delay=1000):
+        # Assign variables
+        self.master = master
+        self.delay = delay # ms
+        self._texts = {}
+        self._after_id = None
+        self._widget = None
+
+        # Create hidden tooltip window
+        self._tip = tk.Toplevel(master)
+        self._tip.withdraw()
+        self._tip.wm_overrideredirect(True)
+        self._label = tk.Label(self._tip, justify=tk.LEFT,
+            background="#ffffe0", relief=tk.SOLID, borderwidth=1)
+        self._label.pack()
+
+        # Bind once on the Toplevel: events from every child pass
+        #   through the Toplevel's bindtag
+        master.bind('<Enter>', self._on_enter, add='+')
+        master.bind('<Leave>', self.hide, add='+')
+        master.bind('<ButtonPress>', self.hide, add='+')
+
+
+    #############
+    # Functions #
+    #############
+    def register(self, widget, text):
+        """ Show TEXT when hovering over WIDGET. """
+        self._texts[str(widget)] = text
+
+
+    def _on_enter(self, event):
+        """ Schedule the tooltip for a registered widget. """
+        if str(event.widget) not in self._texts:
+            return
+        self._cancel()
+        self._widget = event.widget
+        self._after_id = self.master.after(self.delay, self._show)
+
+
+    def hide(self, event=None):
+        """ Cancel any pending tooltip and hide the window. """
+        self._cancel()
+        self._widget = None
+        self._tip.withdraw()
+
+
+    def _cancel(self):
+        """ Cancel the pending show callback. """
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+
+    def _show(self):
+        """ Position and display the tooltip below the widget. """
+        self._after_id = None
+        widget = self._widget
+        if widget is None:
+            return
+        self._label.configure(text=self._texts[str(widget)])
+        x = widget.winfo_rootx() + 1
+        y = widget.winfo_rooty() + widget.winfo_height() + 1
+        self._tip.geometry("+%d+%d" % (x, y))
+        self._tip.deiconify()
+        self._tip.lift()